@@ -0,0 +1,107 @@
+"""
+Benchmark: python-docx Document model vs. streaming iterparse DOCX extraction.
+
+Each extractor runs in a fresh process so its peak RSS can be measured.
+
+Run from the project root:
+    python -m benchmarks.bench_docx --paragraphs 50000
+    python -m benchmarks.bench_docx --file big.docx
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from docx import Document
+from content_inventory.ingestion.parsers.docx_parser import iter_docx_paragraphs
+
+
+def make_docx(path, paragraphs, seed=0):
+    """Synthetic document with a table every 100 paragraphs."""
+    rng = random.Random(seed)
+    vocab = [f"term{i}" for i in range(5000)]
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "Uncontrolled when printed"
+    for i in range(paragraphs):
+        doc.add_paragraph(" ".join(rng.choice(vocab) for _ in range(rng.randint(10, 40))) + ".")
+        if i % 100 == 99:
+            table = doc.add_table(rows=4, cols=3)
+            for cell in table._cells:
+                cell.text = " ".join(rng.choice(vocab) for _ in range(5))
+    doc.save(path)
+
+
+def python_docx_text(path):
+    """The previous implementation: body paragraphs only."""
+    return "\n".join(p.text for p in Document(path).paragraphs if p.text.strip())
+
+
+def streaming_body_text(path):
+    return "\n".join(iter_docx_paragraphs(path, tables=False, headers=False, footnotes=False))
+
+
+def streaming_full_text(path):
+    return "\n".join(iter_docx_paragraphs(path))
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB."""
+    try:
+        # VmHWM starts afresh in a new process; ru_maxrss may carry the parent's peak
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 2 ** 10
+    except OSError:
+        pass
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 2 ** 20 if sys.platform == "darwin" else rss / 2 ** 10
+
+
+def _measure(func, path, queue):
+    before = peak_rss_mb()
+    start = time.perf_counter()
+    text = func(path)
+    queue.put((time.perf_counter() - start, len(text), peak_rss_mb() - before))
+
+
+def measure(func, path):
+    """(seconds, characters extracted, peak RSS growth in MB) of func in a fresh process."""
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_measure, args=(func, path, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DOCX extraction benchmark")
+    parser.add_argument("--paragraphs", type=int, default=50000, help="Paragraphs in the synthetic document")
+    parser.add_argument("--file", default=None, help="Benchmark an existing .docx instead")
+    args = parser.parse_args()
+
+    path = args.file
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(), "bench.docx")
+        make_docx(path, args.paragraphs)
+    size_mb = os.path.getsize(path) / 2 ** 20
+    print(f"{path}: {size_mb:.1f} MB compressed")
+
+    t_base, chars_base, rss_base = measure(python_docx_text, path)
+    print(f"  python-docx (body)      : {t_base:7.2f}s  {chars_base / t_base / 2 ** 20:6.2f} MB text/s  "
+          f"peak RSS +{rss_base:7.1f} MB")
+    for label, func in (("iterparse (body)", streaming_body_text),
+                        ("iterparse (all parts)", streaming_full_text)):
+        seconds, chars, rss = measure(func, path)
+        print(f"  {label:<24}: {seconds:7.2f}s  {chars / seconds / 2 ** 20:6.2f} MB text/s  "
+              f"peak RSS +{rss:7.1f} MB  ({t_base / seconds:4.1f}x, {chars - chars_base:+d} chars)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark: per-token datasketch MinHash vs. vectorized BatchMinHasher.
+
+Run from the project root:
+    python -m benchmarks.bench_minhash --docs 200 --tokens 5000
+"""
+import argparse
+import random
+import time
+import numpy as np
+from datasketch import MinHash
+from content_inventory.analysis.minhash_batch import BatchMinHasher
+
+
+def make_corpus(num_docs, tokens_per_doc, vocab_size, seed=0):
+    rng = random.Random(seed)
+    vocab = [f"term{i}" for i in range(vocab_size)]
+    return [" ".join(rng.choice(vocab) for _ in range(tokens_per_doc)) for _ in range(num_docs)]
+
+
+def per_token(texts, num_perm):
+    sigs = []
+    for text in texts:
+        m = MinHash(num_perm=num_perm)
+        for token in set(text.lower().split()):
+            m.update(token.encode("utf8"))
+        sigs.append(m.hashvalues)
+    return np.array(sigs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MinHash fingerprinting benchmark")
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--tokens", type=int, default=5000)
+    parser.add_argument("--vocab", type=int, default=20000)
+    parser.add_argument("--num-perm", type=int, default=128)
+    args = parser.parse_args()
+
+    texts = make_corpus(args.docs, args.tokens, args.vocab)
+    hasher = BatchMinHasher(num_perm=args.num_perm)
+
+    start = time.perf_counter()
+    baseline = per_token(texts, args.num_perm)
+    t_base = time.perf_counter() - start
+
+    start = time.perf_counter()
+    single = np.array([hasher.signature(t) for t in texts])
+    t_single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = hasher.signatures(texts)
+    t_batch = time.perf_counter() - start
+
+    assert (baseline == single).all() and (baseline == batch).all(), "signatures differ"
+    print(f"{args.docs} docs x {args.tokens} tokens, {args.num_perm} permutations")
+    print(f"  datasketch per-token update : {t_base:8.3f}s  ({args.docs / t_base:8.1f} docs/s)")
+    print(f"  BatchMinHasher.signature    : {t_single:8.3f}s  ({t_base / t_single:5.1f}x)")
+    print(f"  BatchMinHasher.signatures   : {t_batch:8.3f}s  ({t_base / t_batch:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
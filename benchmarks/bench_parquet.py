@@ -0,0 +1,75 @@
+"""
+Benchmark: duplicates.csv vs duplicates.parquet, written by the exporters and
+read back with pandas.
+
+Run from the project root:
+    python -m benchmarks.bench_parquet --rows 10000000
+    python -m benchmarks.bench_parquet --rows 1000000 --row-group 50000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import pandas as pd
+from content_inventory.reports.csv_exporter import CSVExporter
+from content_inventory.reports.parquet_exporter import ParquetExporter
+
+
+class QuietLogger:
+    def info(self, msg):
+        pass
+
+
+def make_duplicates(rows, docs=200_000, seed=0):
+    """Synthetic duplicate pairs over a pool of document names, with a few clusters."""
+    rng = random.Random(seed)
+    names = [f"folder{i % 100}/document_{i:07d}.docx" for i in range(docs)]
+    duplicates = []
+    for _ in range(rows):
+        a, b = sorted(rng.sample(range(docs), 2))
+        duplicates.append({
+            "doc1": names[a], "doc2": names[b],
+            "similarity": round(rng.uniform(0.5, 1.0), 3),
+            "kind": "segment" if rng.random() < 0.2 else "document",
+        })
+    clusters = [{"cluster_id": i + 1, "members": names[i * 10:i * 10 + 10]} for i in range(1000)]
+    return duplicates, clusters
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--row-group", type=int, default=100_000)
+    args = parser.parse_args()
+
+    duplicates, clusters = make_duplicates(args.rows)
+    logger = QuietLogger()
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_exporter = CSVExporter(tmp, logger)
+        parquet_exporter = ParquetExporter(tmp, logger, row_group_size=args.row_group)
+        csv_write, _ = timed(csv_exporter.export_duplicates, duplicates)
+        parquet_write, _ = timed(parquet_exporter.export_duplicates, duplicates, clusters)
+        csv_path = os.path.join(tmp, "duplicates.csv")
+        parquet_path = os.path.join(tmp, "duplicates.parquet")
+        csv_read, csv_df = timed(pd.read_csv, csv_path)
+        parquet_read, parquet_df = timed(pd.read_parquet, parquet_path)
+        assert len(csv_df) == len(parquet_df) == args.rows
+
+        print(f"{args.rows:,} duplicate pairs")
+        print(f"{'format':<10}{'write s':>10}{'read s':>10}{'size MB':>10}")
+        for name, write, read, path in (
+            ("csv", csv_write, csv_read, csv_path),
+            ("parquet", parquet_write, parquet_read, parquet_path),
+        ):
+            print(f"{name:<10}{write:>10.2f}{read:>10.2f}{os.path.getsize(path) / 2 ** 20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+from nltk.tokenize import sent_tokenize, word_tokenize
+from content_inventory.analysis.nlp_resources import get_resources
+
+_SENTENCE_ENDS = (". ", ".\n", "? ", "! ", "\n\n")
+
+
+def iter_windows(text, window_chars):
+    """Split text into consecutive windows of at most window_chars characters.
+
+    Windows end after the last sentence boundary (or, failing that, the last
+    whitespace) inside the limit, so sentences are rarely cut in two."""
+    start = 0
+    while start < len(text):
+        end = start + window_chars
+        if end < len(text):
+            cut = max(text.rfind(mark, start, end) for mark in _SENTENCE_ENDS)
+            if cut <= start:
+                cut = max(text.rfind(" ", start, end), text.rfind("\n", start, end))
+            if cut > start:
+                end = cut + 1
+        yield text[start:end]
+        start = end
+
+
+class Annotation:
+    """Sentences, character spans, tokens and POS tags of one document.
+
+    Built once per document and shared by the summarizer and the noun phrase
+    chunker, so the text is sentence-split and tokenized a single time. POS tags
+    are computed per sentence on first use and then kept, since the summarizer
+    only needs them for candidate sentences."""
+
+    def __init__(self, text, resources=None):
+        self.text = text
+        self.resources = resources or get_resources()
+        self.sentences = sent_tokenize(text) if text.strip() else []
+        self.spans = self._spans()
+        # Sentences are already split, so punkt is not run again per sentence
+        self.tokens = [word_tokenize(s, preserve_line=True) for s in self.sentences]
+        self._tags = [None] * len(self.sentences)
+
+    def __len__(self):
+        return len(self.sentences)
+
+    def _spans(self):
+        """(start, end) character offsets of each sentence in the text."""
+        spans = []
+        pos = 0
+        for sent in self.sentences:
+            start = self.text.find(sent, pos)
+            if start < 0:
+                start = pos
+            pos = start + len(sent)
+            spans.append((start, pos))
+        return spans
+
+    def tagged(self, i):
+        """POS-tagged tokens of sentence i."""
+        tags = self._tags[i]
+        if tags is None:
+            tags = self._tags[i] = self.resources.pos_tag(self.tokens[i])
+        return tags
+
+    # The shared resources hold locks and models, so they are not pickled with
+    # the annotation; the receiving process uses its own instance.
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["resources"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.resources = get_resources()
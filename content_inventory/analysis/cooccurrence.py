@@ -0,0 +1,105 @@
+import heapq
+import numpy as np
+
+
+class CooccurrenceGraph:
+    """Pruned entity co-occurrence graph in coordinate form.
+
+    entities[i] is the i-th node (ordered by document frequency, highest first);
+    each edge is (rows[n], cols[n]) with rows[n] < cols[n] and weight weights[n],
+    the number of documents in which both entities occur."""
+
+    def __init__(self, entities, doc_counts, rows, cols, weights):
+        self.entities = entities
+        self.doc_counts = doc_counts
+        self.rows = rows
+        self.cols = cols
+        self.weights = weights
+
+    @property
+    def num_nodes(self):
+        return len(self.entities)
+
+    @property
+    def num_edges(self):
+        return len(self.weights)
+
+
+class CooccurrenceBuilder:
+    """Counts document-level entity co-occurrences with sparse NumPy arrays.
+
+    Only the top_k entities by document frequency are kept, and pairs seen in
+    fewer than min_weight documents are dropped, so memory is bounded by the
+    number of surviving pairs rather than by entities squared."""
+
+    def __init__(self, top_k=500, min_weight=2, chunk_size=1_000_000):
+        self.top_k = top_k
+        self.min_weight = min_weight
+        self.chunk_size = chunk_size
+
+    def _select_entities(self, index, candidates=None):
+        """Return the top_k entities of an EntityIndex by document frequency.
+
+        candidates restricts the choice, e.g. to the entities an approximate
+        counter reports."""
+        pool = index.postings if candidates is None else [e for e in candidates if e in index.postings]
+        return heapq.nlargest(
+            self.top_k, pool, key=lambda e: (len(index.postings[e]), e)
+        )
+
+    def _incidence(self, index, entities):
+        """Document x entity incidence matrix in CSR form: (indptr, entity ids)."""
+        doc_ids, entity_ids = [], []
+        for entity_id, entity in enumerate(entities):
+            postings = index.postings[entity]
+            doc_ids.append(np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)))
+            entity_ids.append(np.full(len(postings), entity_id, dtype=np.int64))
+        if not doc_ids:
+            return np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        doc_ids = np.concatenate(doc_ids)
+        entity_ids = np.concatenate(entity_ids)
+        order = np.lexsort((entity_ids, doc_ids))
+        indptr = np.zeros(len(index.documents) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(doc_ids, minlength=len(index.documents)), out=indptr[1:])
+        return indptr, entity_ids[order]
+
+    @staticmethod
+    def _merge(acc_codes, acc_counts, codes, counts):
+        codes = np.concatenate([acc_codes, codes])
+        counts = np.concatenate([acc_counts, counts])
+        merged, inverse = np.unique(codes, return_inverse=True)
+        return merged, np.bincount(inverse, weights=counts).astype(np.int64)
+
+    def build(self, index, candidates=None):
+        entities = self._select_entities(index, candidates)
+        k = len(entities)
+        indptr, columns = self._incidence(index, entities)
+
+        acc_codes = np.zeros(0, dtype=np.int64)
+        acc_counts = np.zeros(0, dtype=np.int64)
+        pending, pending_size = [], 0
+
+        def flush():
+            nonlocal acc_codes, acc_counts, pending, pending_size
+            codes, counts = np.unique(np.concatenate(pending), return_counts=True)
+            acc_codes, acc_counts = self._merge(acc_codes, acc_counts, codes, counts)
+            pending, pending_size = [], 0
+
+        # Each pair (i, j) with i < j is encoded as i * k + j
+        for doc_id in range(len(indptr) - 1):
+            ents = columns[indptr[doc_id]:indptr[doc_id + 1]]
+            if len(ents) < 2:
+                continue
+            iu, ju = np.triu_indices(len(ents), 1)
+            pending.append(ents[iu] * k + ents[ju])
+            pending_size += len(iu)
+            if pending_size >= self.chunk_size:
+                flush()
+        if pending:
+            flush()
+
+        keep = acc_counts >= self.min_weight
+        codes, weights = acc_codes[keep], acc_counts[keep]
+        doc_counts = np.array([len(index.postings[e]) for e in entities], dtype=np.int64)
+        return CooccurrenceGraph(entities, doc_counts, codes // max(k, 1), codes % max(k, 1), weights)
@@ -0,0 +1,121 @@
+from collections import Counter
+from itertools import chain
+from content_inventory.analysis.annotation import Annotation, iter_windows
+from content_inventory.analysis.summary_luhn import LuhnSummarizer
+from content_inventory.analysis.nlp_resources import get_resources
+from content_inventory.utils.settings import ClassSettings
+
+SENTIMENT_FIELDS = ("neg", "neu", "pos", "compound")
+
+
+class DocumentAnalyzer(ClassSettings):
+    """Summary, sentiment and (optionally) noun phrases of one document's text.
+
+    Documents up to large_doc_chars are annotated once as a whole. Larger
+    documents are streamed in windows of window_chars: each window is
+    annotated, fed to the summarizer's running term frequencies and bounded
+    candidate heap, chunked for sentiment and passed to the entity extractor,
+    then dropped, so time grows linearly and the analysis working set stays
+    flat (the text itself is held by the caller).
+
+    Defaults are class attributes so main can change them once with
+    configure() and hand the same settings to process workers."""
+
+    SETTINGS = ("large_doc_chars", "window_chars", "sentiment_chunk_chars", "max_candidates")
+    large_doc_chars = 1_000_000
+    window_chars = 100_000
+    sentiment_chunk_chars = 10_000
+    max_candidates = 100
+
+    def __init__(self, logger, resources=None):
+        self.logger = logger
+        self.resources = resources or get_resources()
+        self.summarizer = LuhnSummarizer(logger, resources=self.resources)
+        self.sentiment_analyzer = self.resources.sentiment_analyzer
+
+    def analyze(self, text, extractor=None):
+        """Return a dict with summary and sentiment, plus either the document's
+        entities (when an EntityExtractor is given) or its shared annotation."""
+        if len(text) > self.large_doc_chars:
+            return self.analyze_windows(iter_windows(text, self.window_chars), extractor)
+
+        annotation = Annotation(text, self.resources)
+        result = {
+            "summary": self.summarizer.summarize(text, annotation),
+            "sentiment": self.sentiment_analyzer.polarity_scores(text),
+        }
+        if extractor is not None:
+            result["entities"] = extractor.extract_document(text, annotation)
+        else:
+            result["annotation"] = annotation
+        return result
+
+    def analyze_stream(self, pieces, extractor=None, separator=""):
+        """Analyze text that arrives in pieces (pages, paragraphs) joined by separator.
+
+        Pieces are collected until the text is known to be small, which is then
+        analyzed whole; past large_doc_chars the remaining pieces go through the
+        windowed mode as they arrive, so the NLP working set (annotations, tags,
+        summary candidates) is bounded by the window size. The full text is
+        still assembled and returned, since word counts, fingerprints and the
+        cache digest need it, so memory for the text itself grows with the
+        document. Returns (text, analysis); analysis is None when the text is
+        blank."""
+        pieces = iter(pieces)
+        head, size = [], 0
+        for piece in pieces:
+            head.append(piece)
+            size += len(piece) + len(separator)
+            if size > self.large_doc_chars:
+                break
+        else:
+            text = separator.join(head)
+            return text, (self.analyze(text, extractor) if text.strip() else None)
+
+        collected = []
+        analysis = self.analyze_windows(self._windows(chain(head, pieces), collected, separator), extractor)
+        return separator.join(collected), analysis
+
+    def _windows(self, pieces, collected, separator):
+        """Group pieces into windows of about window_chars, keeping every piece in collected."""
+        window, size = [], 0
+        for piece in pieces:
+            collected.append(piece)
+            window.append(piece)
+            size += len(piece) + len(separator)
+            if size >= self.window_chars:
+                yield separator.join(window) + separator
+                window, size = [], 0
+        if window:
+            yield separator.join(window)
+
+    def analyze_windows(self, windows, extractor=None):
+        """Large-document mode over an iterable of text windows (see class docstring)."""
+        self.logger.debug("Analyzing large document in windows.")
+        entities = None if extractor is None else Counter()
+        sentiment = dict.fromkeys(SENTIMENT_FIELDS, 0.0)
+        weight = 0
+
+        def annotated():
+            nonlocal weight
+            for window in windows:
+                annotation = Annotation(window, self.resources)
+                # Sentiment is scored per chunk and averaged by chunk length
+                for chunk in iter_windows(window, self.sentiment_chunk_chars):
+                    if not chunk.strip():
+                        continue
+                    scores = self.sentiment_analyzer.polarity_scores(chunk)
+                    for field in SENTIMENT_FIELDS:
+                        sentiment[field] += scores.get(field, 0.0) * len(chunk)
+                    weight += len(chunk)
+                if extractor is not None:
+                    extractor.extract_annotation(annotation, entities)
+                yield annotation
+
+        summary = self.summarizer.summarize_windows(annotated(), max_candidates=self.max_candidates)
+        if weight:
+            sentiment = {field: round(value / weight, 4) for field, value in sentiment.items()}
+        result = {"summary": summary, "sentiment": sentiment}
+        if entities is not None:
+            result["entities"] = entities
+        return result
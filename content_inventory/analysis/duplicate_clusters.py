@@ -0,0 +1,89 @@
+from collections import defaultdict
+
+
+class UnionFind:
+    """Disjoint-set forest with path halving and union by size."""
+
+    def __init__(self):
+        self.parent = {}
+        self.size = {}
+
+    def find(self, x):
+        parent = self.parent
+        if x not in parent:
+            parent[x] = x
+            self.size[x] = 1
+            return x
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return ra
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
+        return ra
+
+
+def cluster_duplicates(duplicates):
+    """Group canonical duplicate pairs into connected clusters of document paths.
+
+    Only near-duplicate ("document") pairs are clustered; documents that merely
+    share a passage ("segment" pairs) would chain unrelated documents together.
+
+    Returns a list of cluster dicts ordered by size (largest first) with keys
+    cluster_id, representative, members, size, max_similarity, min_similarity,
+    and edges (member -> similarity to the representative, when a direct pair
+    exists). The representative is the member with the most duplicate pairs."""
+    duplicates = [d for d in duplicates if d.get("kind", "document") == "document"]
+    uf = UnionFind()
+    degree = defaultdict(int)
+    for d in duplicates:
+        uf.union(d["doc1"], d["doc2"])
+        degree[d["doc1"]] += 1
+        degree[d["doc2"]] += 1
+
+    groups = defaultdict(list)
+    for doc in uf.parent:
+        groups[uf.find(doc)].append(doc)
+
+    stats = {root: [0.0, 1.0] for root in groups}  # [max, min] similarity
+    for d in duplicates:
+        s = stats[uf.find(d["doc1"])]
+        s[0] = max(s[0], d["similarity"])
+        s[1] = min(s[1], d["similarity"])
+
+    clusters = []
+    for root, members in groups.items():
+        members.sort()
+        representative = min(members, key=lambda m: (-degree[m], m))
+        clusters.append({
+            "representative": representative,
+            "members": members,
+            "size": len(members),
+            "max_similarity": stats[root][0],
+            "min_similarity": stats[root][1],
+            "edges": {},
+            "_root": root,
+        })
+    clusters.sort(key=lambda c: (-c["size"], c["representative"]))
+
+    by_root = {}
+    for cluster_id, cluster in enumerate(clusters, start=1):
+        cluster["cluster_id"] = cluster_id
+        by_root[cluster.pop("_root")] = cluster
+
+    # Second pass: similarity of each member to its cluster representative
+    for d in duplicates:
+        cluster = by_root[uf.find(d["doc1"])]
+        rep = cluster["representative"]
+        if d["doc1"] == rep:
+            cluster["edges"][d["doc2"]] = d["similarity"]
+        elif d["doc2"] == rep:
+            cluster["edges"][d["doc1"]] = d["similarity"]
+    return clusters
@@ -1,42 +1,126 @@
-from datasketch import MinHash, MinHashLSH
-from itertools import combinations
-import hashlib
+from datasketch import MinHashLSH, LeanMinHash
+import numpy as np
+from content_inventory.analysis.minhash_batch import BatchMinHasher
 
 class DuplicateDetector:
     """Detects near-duplicate documents using MinHash and LSH for fast text reuse detection."""
 
-    def __init__(self, logger, threshold=0.8):
+    NUM_PERM = 128
+    SEED = 1
+    # Signatures are kept as uint32 vectors (values are masked to 32 bits)
+    SIGNATURE_DTYPE = np.uint32
+
+    def __init__(self, logger, threshold=0.8, index=None):
         self.logger = logger
         self.threshold = threshold
+        # Optional PersistentLSH; when set, only new or changed documents are queried
+        self.index = index
+        self.hasher = BatchMinHasher(num_perm=self.NUM_PERM, seed=self.SEED)
+        # path -> MinHash signature; the only per-document state kept
+        self.signatures = {}
+        # Documents fingerprinted in this run rather than restored from the cache
+        self.fresh = set()
+
+    def fingerprint(self, text):
+        """MinHash signature of one document's text."""
+        return self.hasher.signature(text)
+
+    def add_document(self, doc):
+        """Fingerprint one document, reusing a cached signature when present."""
+        signature = doc.get("signature")
+        if signature is None:
+            signature = doc["signature"] = self.fingerprint(doc["text"])
+        self.signatures[doc["path"]] = signature
+        if not doc.get("cached"):
+            self.fresh.add(doc["path"])
 
-    def _get_fingerprint(self, text):
-        m = MinHash(num_perm=128)
-        for token in set(text.lower().split()):
-            m.update(token.encode('utf8'))
-        return m
+    def add_documents(self, docs):
+        """Fingerprint a batch of documents in one vectorized pass."""
+        pending = [doc for doc in docs if doc.get("signature") is None]
+        if pending:
+            matrix = self.hasher.signatures([doc["text"] for doc in pending])
+            for doc, signature in zip(pending, matrix):
+                doc["signature"] = signature
+        for doc in docs:
+            self.signatures[doc["path"]] = doc["signature"]
+            if not doc.get("cached"):
+                self.fresh.add(doc["path"])
+
+    def find_duplicates(self, corpus=()):
+        """Return near-duplicate pairs among all added documents plus any in corpus.
+
+        Documents are identified by path, so files with the same name in
+        different folders are compared like any other pair."""
+        self.add_documents(list(corpus))
+        if self.index is not None:
+            return self._find_incremental()
 
-    def find_duplicates(self, corpus):
         self.logger.info("Detecting near-duplicate content using MinHash...")
-        lsh = MinHashLSH(threshold=self.threshold, num_perm=128)
+        lsh = MinHashLSH(threshold=self.threshold, num_perm=self.NUM_PERM)
         fingerprints = {}
 
-        # Build fingerprints
-        for doc in corpus:
-            m = self._get_fingerprint(doc["text"])
-            fingerprints[doc["filename"]] = m
-            lsh.insert(doc["filename"], m)
+        # Build fingerprints (LeanMinHash skips regenerating the permutations)
+        for path, signature in self.signatures.items():
+            m = LeanMinHash(seed=self.SEED, hashvalues=signature.astype(np.uint64))
+            fingerprints[path] = m
+            lsh.insert(path, m)
 
-        # Compare documents through LSH
+        # Compare documents through LSH; each pair is emitted once with doc1 < doc2.
+        # LSH candidates can fall below the threshold, so each one is checked.
         duplicates = []
-        for fname, m in fingerprints.items():
+        for path, m in fingerprints.items():
             matches = lsh.query(m)
             for match in matches:
-                if match != fname:
-                    duplicates.append({
-                        "doc1": fname,
-                        "doc2": match,
-                        "similarity": round(m.jaccard(fingerprints[match]), 3)
-                    })
+                if path < match:
+                    similarity = round(m.jaccard(fingerprints[match]), 3)
+                    if similarity >= self.threshold:
+                        duplicates.append({
+                            "doc1": path,
+                            "doc2": match,
+                            "similarity": similarity,
+                            "kind": "document",
+                        })
+
+        self.logger.success(f"Detected {len(duplicates)} duplicate pairs.")
+        return duplicates
+
+    def _jaccard(self, sig1, sig2):
+        return round(float(np.count_nonzero(sig1 == sig2)) / len(sig1), 3)
+
+    def _find_incremental(self):
+        """Update the persistent LSH index with the delta and query only changed documents."""
+        self.logger.info("Detecting near-duplicate content using the persistent MinHash LSH index...")
+        index = self.index
+        stored = index.keys()
+        removed = stored - self.signatures.keys()
+        changed = [
+            key for key, signature in self.signatures.items()
+            if key not in stored
+            or (key in self.fresh and not np.array_equal(index.get(key), signature))
+        ]
+
+        index.remove(removed | set(changed))
+        for key in changed:
+            index.insert(key, self.signatures[key])
+
+        # Canonical (doc1 < doc2) pairs; a pair of two changed documents is scored once
+        pairs = {}
+        for key in changed:
+            signature = self.signatures[key]
+            for match in index.query(signature):
+                pair = (key, match) if key < match else (match, key)
+                if match != key and pair not in pairs:
+                    pairs[pair] = self._jaccard(signature, self.signatures[match])
+        index.add_pairs((d1, d2, sim) for (d1, d2), sim in pairs.items() if sim >= self.threshold)
+        index.commit()
+        self.logger.info(
+            f"LSH index: {len(changed)} new or changed, {len(removed)} removed, "
+            f"{len(self.signatures) - len(changed)} unchanged documents."
+        )
 
+        duplicates = [
+            {"doc1": d1, "doc2": d2, "similarity": sim, "kind": "document"}
+            for d1, d2, sim in index.pairs()
+        ]
         self.logger.success(f"Detected {len(duplicates)} duplicate pairs.")
-        return duplicates
\ No newline at end of file
+        return duplicates
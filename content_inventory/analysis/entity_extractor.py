@@ -1,72 +1,154 @@
-import nltk
-from nltk import pos_tag, word_tokenize
 from nltk.chunk import RegexpParser
-from nltk.stem import WordNetLemmatizer
-from nltk.corpus import wordnet, stopwords
+from nltk.corpus.reader.wordnet import NOUN, ADJ, VERB, ADV
 from collections import Counter
 import string
+from content_inventory.analysis.nlp_resources import get_resources
+from content_inventory.analysis.entity_index import EntityIndex
+from content_inventory.analysis.annotation import Annotation
 
 class EntityExtractor:
     """Extracts single- and multi-word noun phrases, normalizes plurals,
     and removes stopwords inside phrases."""
 
-    def __init__(self, logger):
+    GRAMMAR = r"NP: {<JJ>*<NN.*>+}"  # simple but effective noun phrase grammar
+    # Bump when normalization changes so cached per-document phrases are invalidated
+    VERSION = "1"
+
+    # First letter of a Penn Treebank tag -> WordNet POS (anything else is a noun)
+    WORDNET_POS = {"N": NOUN, "J": ADJ, "V": VERB, "R": ADV}
+
+    def __init__(self, logger, resources=None, lemma_cache_size=200_000, phrase_cache_size=200_000,
+                 heavy_hitters=None):
         self.logger = logger
+        # Per-document counts are added to self.entities as documents arrive,
+        # or fed to an approximate SpaceSaving counter when one is given
         self.entities = Counter()
-        self.lemmatizer = WordNetLemmatizer()
+        self.heavy_hitters = heavy_hitters
+        # entity -> documents postings, built as each document is processed; in
+        # approximate mode only monitored entities keep postings, so the index is
+        # bounded by the counter's capacity as well
+        self.index = EntityIndex()
+        self.chunker = RegexpParser(self.GRAMMAR)
+        self.resources = resources or get_resources()
+        self.lemmatizer = self.resources.lemmatizer
+        self.stop_words = self.resources.stop_words
+        # Vocabulary repeats heavily across documents, so lemmas and whole
+        # normalized phrases are memoized; a cache is cleared when it fills up
+        self.lemma_cache_size = lemma_cache_size
+        self.phrase_cache_size = phrase_cache_size
+        self._lemmas = {}  # (word, wordnet pos) -> lemma
+        self._phrases = {}  # tuple of tagged leaves -> normalized phrase
+        self.lemma_hits = self.lemma_misses = 0
+        self.phrase_hits = self.phrase_misses = 0
+
+    def cache_info(self):
+        """Hit/miss counters and current sizes of the lemma and phrase caches."""
+        return {
+            "lemma_hits": self.lemma_hits,
+            "lemma_misses": self.lemma_misses,
+            "lemma_size": len(self._lemmas),
+            "phrase_hits": self.phrase_hits,
+            "phrase_misses": self.phrase_misses,
+            "phrase_size": len(self._phrases),
+        }
 
-        # Ensure NLTK resources are available
-        nltk.download('punkt', quiet=True)
-        nltk.download('averaged_perceptron_tagger', quiet=True)
-        nltk.download('wordnet', quiet=True)
-        nltk.download('omw-1.4', quiet=True)
-        nltk.download('stopwords', quiet=True)
-        self.stop_words = set(stopwords.words('english'))
+    def _lemmatize(self, word, wn_pos):
+        key = (word, wn_pos)
+        lemma = self._lemmas.get(key)
+        if lemma is not None:
+            self.lemma_hits += 1
+            return lemma
+        self.lemma_misses += 1
+        if len(self._lemmas) >= self.lemma_cache_size:
+            self._lemmas.clear()
+        lemma = self._lemmas[key] = self.lemmatizer.lemmatize(word, wn_pos)
+        return lemma
 
     def _lemmatize_phrase(self, phrase_tokens):
         """Lemmatize tokens in a noun phrase and remove stopwords."""
+        key = tuple(phrase_tokens)
+        phrase = self._phrases.get(key)
+        if phrase is not None:
+            self.phrase_hits += 1
+            return phrase
+        self.phrase_misses += 1
+        if len(self._phrases) >= self.phrase_cache_size:
+            self._phrases.clear()
+        phrase = self._phrases[key] = self._normalize_phrase(phrase_tokens)
+        return phrase
+
+    def _normalize_phrase(self, phrase_tokens):
         normalized = []
         for word, pos in phrase_tokens:
             word = word.lower().strip()
             if word in self.stop_words or word in string.punctuation:
                 continue
 
-            # POS mapping for lemmatizer
-            wn_pos = (
-                wordnet.NOUN if pos.startswith('N') else
-                wordnet.ADJ if pos.startswith('J') else
-                wordnet.VERB if pos.startswith('V') else
-                wordnet.ADV if pos.startswith('R') else
-                wordnet.NOUN
-            )
-
-            lemma = self.lemmatizer.lemmatize(word, wn_pos)
+            lemma = self._lemmatize(word, self.WORDNET_POS.get(pos[:1], NOUN))
             normalized.append(lemma)
 
         # Return joined phrase, skipping empty results
         return " ".join(normalized).strip()
 
+    def extract_document(self, text, annotation=None):
+        """Return a Counter of the normalized noun phrases in a single document.
+
+        annotation is the document's shared Annotation; it is built here if not given."""
+        phrases = Counter()
+        if not text.strip():
+            return phrases
+
+        if annotation is None:
+            annotation = Annotation(text, self.resources)
+        return self.extract_annotation(annotation, phrases)
+
+    def extract_annotation(self, annotation, phrases=None):
+        """Add the noun phrases of an Annotation (a document or one window of it) to phrases."""
+        if phrases is None:
+            phrases = Counter()
+        for i in range(len(annotation)):
+            tree = self.chunker.parse(annotation.tagged(i))
+
+            for subtree in tree.subtrees(filter=lambda t: t.label() == 'NP'):
+                phrase = self._lemmatize_phrase(subtree.leaves())
+                if len(phrase) > 1:  # skip single characters or empty results
+                    phrases[phrase] += 1
+        return phrases
+
+    def process_document(self, doc):
+        """Add one document's noun phrases to the corpus counts.
+
+        Per-document counts are kept on the document under "entities"; documents
+        that already carry them (restored from the cache or extracted inside an
+        ingestion worker) are not re-parsed. Call finalize() once all documents
+        are processed to obtain self.entities."""
+        doc_entities = doc.get("entities")
+        if doc_entities is None:
+            doc_entities = doc["entities"] = self.extract_document(
+                doc.get("text", ""), doc.get("annotation")
+            )
+        if self.heavy_hitters is not None:
+            self.index.remove(self.heavy_hitters.update(doc_entities))
+            monitored = {e: c for e, c in doc_entities.items() if e in self.heavy_hitters}
+            self.index.add_document(doc, monitored)
+        else:
+            self.entities.update(doc_entities)
+            self.index.add_document(doc, doc_entities)
+        return doc_entities
+
+    def finalize(self):
+        """Return the corpus counts (self.entities), switching to the approximate counter if used."""
+        if self.heavy_hitters is not None:
+            self.entities = self.heavy_hitters
+        return self.entities
+
     def process_corpus(self, corpus):
         """Extract noun phrases (multi-word, lemmatized, stopword-filtered)."""
         self.logger.info("Extracting normalized noun phrases (multi-word, no stopwords)...")
 
-        grammar = r"NP: {<JJ>*<NN.*>+}"  # simple but effective noun phrase grammar
-        chunker = RegexpParser(grammar)
-
         for doc in corpus:
-            text = doc.get("text", "")
-            if not text.strip():
-                continue
-
-            for sent in nltk.sent_tokenize(text):
-                tokens = word_tokenize(sent)
-                tagged = pos_tag(tokens)
-                tree = chunker.parse(tagged)
-
-                for subtree in tree.subtrees(filter=lambda t: t.label() == 'NP'):
-                    phrase = self._lemmatize_phrase(subtree.leaves())
-                    if len(phrase) > 1:  # skip single characters or empty results
-                        self.entities[phrase] += 1
+            self.process_document(doc)
+        self.finalize()
 
         self.logger.success(f"Extracted {len(self.entities)} clean, normalized entities.")
-        return self.entities
\ No newline at end of file
+        return self.entities
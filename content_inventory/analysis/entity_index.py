@@ -0,0 +1,46 @@
+from collections import defaultdict
+
+
+class EntityIndex:
+    """Inverted index of entity -> documents, filled while entities are extracted.
+
+    Documents get sequential integer ids in the order they are added, which is
+    also the order used for document ids in the reports."""
+
+    def __init__(self):
+        self.documents = []  # doc_id -> (path, filename)
+        self.postings = defaultdict(dict)  # entity -> {doc_id: count}
+
+    def __len__(self):
+        return len(self.postings)
+
+    def add_document(self, doc, entities):
+        """Register a document and the phrase counts extracted from it; returns its id."""
+        doc_id = len(self.documents)
+        self.documents.append((doc["path"], doc["filename"]))
+        for entity, count in entities.items():
+            self.postings[entity][doc_id] = count
+        return doc_id
+
+    def remove(self, entities):
+        """Drop every posting of the given entities."""
+        for entity in entities:
+            self.postings.pop(entity, None)
+
+    def documents_for(self, entity):
+        """Return the ids of the documents an entity was extracted from."""
+        return list(self.postings.get(entity, ()))
+
+    def document_count(self, entity):
+        return len(self.postings.get(entity, ()))
+
+    def label(self, doc_id):
+        """Human-readable "id:filename" label used in report annotations."""
+        return f"{doc_id}:{self.documents[doc_id][1]}"
+
+    def iter_postings(self):
+        """Yield (entity, doc_id, path, filename, count) for every posting."""
+        for entity, docs in self.postings.items():
+            for doc_id, count in docs.items():
+                path, filename = self.documents[doc_id]
+                yield entity, doc_id, path, filename, count
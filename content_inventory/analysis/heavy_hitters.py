@@ -0,0 +1,99 @@
+import heapq
+
+
+class SpaceSaving:
+    """Approximate frequent-item counter (Space-Saving, Metwally et al., 2005).
+
+    At most `capacity` items are monitored. When a new item arrives and the
+    table is full, the item with the smallest count is replaced and the new
+    item inherits that count as its error. Every reported count overestimates
+    the true count by at most errors[item], which is itself bounded by
+    total / capacity; any item with a true count above that bound is
+    guaranteed to be monitored.
+
+    Supports the parts of the Counter interface used by the reports and the
+    database: update(), most_common(), items(), len() and iteration. items()
+    and iteration cover the top_k most frequent items only, since the tail of
+    the table is dominated by the error term."""
+
+    # Rough memory per monitored item (key string, two dict entries, heap entries)
+    ENTRY_BYTES = 400
+
+    def __init__(self, capacity, top_k=None):
+        if capacity < 1:
+            raise ValueError("SpaceSaving capacity must be at least 1")
+        self.capacity = capacity
+        self.top_k = top_k
+        self.counts = {}
+        self.errors = {}
+        self.total = 0
+        # Min-heap of (count, item); stale entries are skipped when popped
+        self._heap = []
+
+    @classmethod
+    def from_memory_budget(cls, megabytes, top_k=None):
+        """Size the table so it stays within roughly `megabytes` of memory."""
+        return cls(max(1, int(megabytes * 2 ** 20) // cls.ENTRY_BYTES), top_k=top_k)
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __iter__(self):
+        return (item for item, _ in self.items())
+
+    def _pop_min(self):
+        """Remove and return (count, item) of the least frequent monitored item."""
+        while True:
+            count, item = heapq.heappop(self._heap)
+            if self.counts.get(item) == count:
+                return count, item
+
+    def _push(self, item, count):
+        heapq.heappush(self._heap, (count, item))
+        if len(self._heap) > 4 * self.capacity:
+            # Drop stale entries so the heap stays proportional to the table
+            self._heap = [(c, i) for i, c in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def add(self, item, count=1):
+        """Count item; returns the item evicted to make room for it, or None."""
+        self.total += count
+        evicted = None
+        if item in self.counts:
+            self.counts[item] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = count
+            self.errors[item] = 0
+        else:
+            floor, evicted = self._pop_min()
+            del self.counts[evicted]
+            del self.errors[evicted]
+            self.counts[item] = floor + count
+            self.errors[item] = floor
+        self._push(item, self.counts[item])
+        return evicted
+
+    def update(self, counts):
+        """Add every (item, count) of a mapping, like Counter.update.
+
+        Returns the items that are no longer monitored afterwards."""
+        evicted = []
+        for item, count in counts.items():
+            dropped = self.add(item, count)
+            if dropped is not None:
+                evicted.append(dropped)
+        return [item for item in evicted if item not in self.counts]
+
+    def __contains__(self, item):
+        return item in self.counts
+
+    def error_bound(self):
+        """Maximum overestimation of any reported count (total / capacity)."""
+        return self.total // self.capacity
+
+    def most_common(self, n=None):
+        ranked = sorted(self.counts.items(), key=lambda kv: (-kv[1], kv[0]))
+        return ranked if n is None else ranked[:n]
+
+    def items(self):
+        return self.most_common(self.top_k)
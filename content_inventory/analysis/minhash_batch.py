@@ -0,0 +1,87 @@
+import hashlib
+import numpy as np
+
+# Same constants as datasketch.MinHash, so signatures are interchangeable
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+class BatchMinHasher:
+    """Vectorized MinHash fingerprinting.
+
+    Produces exactly the hash values datasketch.MinHash(num_perm, seed) would
+    after update() with each token (SHA-1 32-bit token hashes, the same random
+    permutations and the same uint64 arithmetic), so signatures work with
+    MinHashLSH and its threshold semantics. Signatures are returned as uint32,
+    since every value is masked to 32 bits."""
+
+    def __init__(self, num_perm=128, seed=1, block_size=128, token_cache_size=1_000_000):
+        self.num_perm = num_perm
+        self.seed = seed
+        # Tokens permuted at once; small blocks keep the temporary matrix in cache
+        self.block_size = block_size
+        # Documents share most of their vocabulary, so token hashes are memoized
+        self.token_cache_size = token_cache_size
+        self._token_hashes = {}
+        gen = np.random.RandomState(seed)
+        self.a, self.b = np.array(
+            [
+                (
+                    gen.randint(1, _MERSENNE_PRIME, dtype=np.uint64),
+                    gen.randint(0, _MERSENNE_PRIME, dtype=np.uint64),
+                )
+                for _ in range(num_perm)
+            ],
+            dtype=np.uint64,
+        ).T
+
+    @staticmethod
+    def tokenize(text):
+        """Unique lowercase whitespace tokens, as used for document fingerprints."""
+        return set(text.lower().split())
+
+    def hash_tokens(self, tokens):
+        """32-bit SHA-1 hash of each token (datasketch's sha1_hash32), memoized."""
+        cache = self._token_hashes
+        missing = [t for t in tokens if t not in cache]
+        if len(cache) + len(missing) > self.token_cache_size:
+            # Start over with just this document's tokens, so every lookup below hits
+            cache.clear()
+            missing = tokens
+        for t in missing:
+            cache[t] = int.from_bytes(hashlib.sha1(t.encode("utf8")).digest()[:4], "little")
+        return np.fromiter((cache[t] for t in tokens), dtype=np.uint64, count=len(tokens))
+
+    def _permuted(self, hv):
+        """Apply every permutation to a block of token hashes: shape (len(hv), num_perm)."""
+        return (hv[:, None] * self.a + self.b) % _MERSENNE_PRIME & _MAX_HASH
+
+    def signature(self, text):
+        """MinHash signature of a single document as a uint32 vector."""
+        hv = self.hash_tokens(self.tokenize(text))
+        sig = np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        for start in range(0, len(hv), self.block_size):
+            np.minimum(sig, self._permuted(hv[start:start + self.block_size]).min(axis=0), out=sig)
+        return sig.astype(np.uint32)
+
+    def signatures(self, texts):
+        """Signatures for a batch of documents as a (len(texts), num_perm) uint32 matrix.
+
+        Token hashes of all documents are concatenated and reduced per document
+        with np.minimum.reduceat, so small documents share vectorized blocks."""
+        hashed = [self.hash_tokens(self.tokenize(t)) for t in texts]
+        lengths = np.array([len(h) for h in hashed], dtype=np.int64)
+        out = np.full((len(texts), self.num_perm), _MAX_HASH, dtype=np.uint64)
+        if not lengths.sum():
+            return out.astype(np.uint32)
+
+        hv = np.concatenate(hashed)
+        doc_of = np.repeat(np.arange(len(texts)), lengths)
+        for start in range(0, len(hv), self.block_size):
+            block_docs = doc_of[start:start + self.block_size]
+            # Boundaries where the owning document changes inside this block
+            bounds = np.flatnonzero(np.r_[True, block_docs[1:] != block_docs[:-1]])
+            mins = np.minimum.reduceat(self._permuted(hv[start:start + self.block_size]), bounds, axis=0)
+            docs = block_docs[bounds]
+            out[docs] = np.minimum(out[docs], mins)
+        return out.astype(np.uint32)
@@ -0,0 +1,119 @@
+import threading
+import nltk
+from nltk.corpus import stopwords, wordnet
+from nltk.stem import WordNetLemmatizer
+from nltk.tag.perceptron import PerceptronTagger
+from nltk.sentiment import SentimentIntensityAnalyzer
+
+
+class NLPResources:
+    """Process-wide registry that loads NLTK models once and shares them
+    between parsers, the summarizer, and the entity extractor."""
+
+    # NLTK package name -> resource path checked with nltk.data.find
+    REQUIRED = {
+        "punkt": "tokenizers/punkt",
+        "averaged_perceptron_tagger": "taggers/averaged_perceptron_tagger",
+        "wordnet": "corpora/wordnet",
+        "omw-1.4": "corpora/omw-1.4",
+        "stopwords": "corpora/stopwords",
+        "vader_lexicon": "sentiment/vader_lexicon.zip",
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stop_words = None
+        self._tagger = None
+        self._lemmatizer = None
+        self._sentiment_analyzer = None
+
+    # --------------------------------------------------------------
+    # Startup verification
+    # --------------------------------------------------------------
+    def missing(self):
+        """Return the NLTK packages that cannot be found locally."""
+        missing = []
+        for package, resource in self.REQUIRED.items():
+            try:
+                nltk.data.find(resource)
+            except LookupError:
+                missing.append(package)
+        return missing
+
+    def verify(self, logger, offline=False):
+        """Check all required NLTK data once. Downloads missing packages unless
+        offline is set, in which case a LookupError is raised immediately."""
+        missing = self.missing()
+        if not missing:
+            logger.info("NLTK resources verified.")
+            return
+
+        if offline:
+            raise LookupError(
+                f"Missing NLTK resources (offline mode): {', '.join(missing)}. "
+                f"Run: python -m nltk.downloader {' '.join(missing)}"
+            )
+
+        logger.info(f"Downloading missing NLTK resources: {', '.join(missing)}")
+        for package in missing:
+            nltk.download(package, quiet=True)
+
+        still_missing = self.missing()
+        if still_missing:
+            raise LookupError(f"Unable to obtain NLTK resources: {', '.join(still_missing)}")
+        logger.success("NLTK resources downloaded and verified.")
+
+    # --------------------------------------------------------------
+    # Shared, lazily loaded models
+    # --------------------------------------------------------------
+    @property
+    def stop_words(self):
+        if self._stop_words is None:
+            with self._lock:
+                if self._stop_words is None:
+                    self._stop_words = frozenset(stopwords.words("english"))
+        return self._stop_words
+
+    @property
+    def tagger(self):
+        if self._tagger is None:
+            with self._lock:
+                if self._tagger is None:
+                    self._tagger = PerceptronTagger()
+        return self._tagger
+
+    @property
+    def lemmatizer(self):
+        if self._lemmatizer is None:
+            with self._lock:
+                if self._lemmatizer is None:
+                    # The wordnet corpus loader is lazy and not thread-safe on first use
+                    wordnet.ensure_loaded()
+                    self._lemmatizer = WordNetLemmatizer()
+        return self._lemmatizer
+
+    @property
+    def sentiment_analyzer(self):
+        if self._sentiment_analyzer is None:
+            with self._lock:
+                if self._sentiment_analyzer is None:
+                    self._sentiment_analyzer = SentimentIntensityAnalyzer()
+        return self._sentiment_analyzer
+
+    def pos_tag(self, tokens):
+        """Equivalent of nltk.pos_tag that reuses the loaded perceptron model."""
+        return self.tagger.tag(tokens)
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_resources():
+    """Return the process-wide NLPResources instance."""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = NLPResources()
+    return _shared
@@ -0,0 +1,209 @@
+import re
+import zlib
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+_TOKEN = re.compile(r"\w+")
+_BASE = np.uint64(1_000_003)
+
+
+def pack_segments(segments):
+    """Serialize (hashes, starts, ends, text_length) into bytes for the cache."""
+    hashes, starts, ends, length = segments
+    return (
+        np.uint64(length).tobytes()
+        + hashes.astype(np.uint64).tobytes()
+        + starts.astype(np.uint32).tobytes()
+        + ends.astype(np.uint32).tobytes()
+    )
+
+
+def unpack_segments(blob):
+    length = int(np.frombuffer(blob[:8], dtype=np.uint64)[0])
+    n = (len(blob) - 8) // 16
+    hashes = np.frombuffer(blob, dtype=np.uint64, count=n, offset=8)
+    starts = np.frombuffer(blob, dtype=np.uint32, count=n, offset=8 + 8 * n)
+    ends = np.frombuffer(blob, dtype=np.uint32, count=n, offset=8 + 12 * n)
+    return hashes, starts, ends, length
+
+
+class SegmentReuseDetector:
+    """Finds passages reused between documents with k-gram winnowing fingerprints.
+
+    Each document is reduced to the minimum hash of every window of `window`
+    consecutive word k-grams (Schleimer et al., 2003), which guarantees that any
+    shared run of at least window + k - 1 words yields a common fingerprint.
+    Fingerprints shared by more than max_doc_freq entries (boilerplate) are
+    ignored. Matching is a sort over all fingerprints plus a linear merge of
+    matches into passages, so cost grows near-linearly with corpus size.
+
+    A shared run's first and last fingerprints may lie up to window - 1 words
+    inside it, so each fingerprint's span is widened by that many words on
+    either side (within the document). Passages therefore cover the whole
+    reused run, and may overstate it by up to that margin at each end."""
+
+    # Fingerprinting parameters are fixed so cached fingerprints stay comparable
+    K = 12
+    WINDOW = 24
+    # Bump when the stored spans change (2: spans widened by the window)
+    FORMAT = 2
+
+    def __init__(self, logger, max_doc_freq=50, min_matches=3, max_gap=300):
+        self.logger = logger
+        self.k = self.K
+        self.window = self.WINDOW
+        self.max_doc_freq = max_doc_freq
+        self.min_matches = min_matches
+        self.max_gap = max_gap  # characters allowed between matches of one passage
+        self.paths = []
+        self.fingerprints = []  # per document: (hashes, starts, ends, text_length)
+
+    def fingerprint(self, text):
+        """Winnowed fingerprints of text: (hashes, char starts, char ends, text length).
+
+        The text length runs from the first word to the last, so a passage that
+        covers every word of a document is its whole length."""
+        matches = list(_TOKEN.finditer(text))
+        n = len(matches) - self.k + 1
+        if n <= 0:
+            empty = np.zeros(0, dtype=np.uint64)
+            length = matches[-1].end() - matches[0].start() if matches else 0
+            return empty, empty.astype(np.uint32), empty.astype(np.uint32), length
+
+        tokens = np.fromiter(
+            (zlib.crc32(m.group().lower().encode("utf8")) for m in matches),
+            dtype=np.uint64, count=len(matches)
+        )
+        tok_starts = np.fromiter((m.start() for m in matches), dtype=np.uint32, count=len(matches))
+        tok_ends = np.fromiter((m.end() for m in matches), dtype=np.uint32, count=len(matches))
+
+        # Polynomial hash of each k-gram (uint64 arithmetic wraps around)
+        grams = np.zeros(n, dtype=np.uint64)
+        for j in range(self.k):
+            grams = grams * _BASE + tokens[j:j + n]
+
+        if n <= self.window:
+            selected = np.array([np.argmin(grams)])
+        else:
+            windows = sliding_window_view(grams, self.window)
+            selected = np.unique(windows.argmin(axis=1) + np.arange(len(windows)))
+        margin = self.window - 1
+        first = np.maximum(selected - margin, 0)
+        last = np.minimum(selected + self.k - 1 + margin, len(matches) - 1)
+        return grams[selected], tok_starts[first], tok_ends[last], int(tok_ends[-1] - tok_starts[0])
+
+    def add_document(self, doc):
+        """Fingerprint one document, reusing cached fingerprints when present."""
+        segments = doc.get("segments")
+        if segments is None:
+            segments = doc["segments"] = self.fingerprint(doc["text"])
+        self.paths.append(doc["path"])
+        self.fingerprints.append(segments)
+
+    def _matches(self):
+        """All cross-document fingerprint matches as columns (d1, d2, s1, e1, s2, e2)."""
+        counts = [len(f[0]) for f in self.fingerprints]
+        if not sum(counts):
+            return None
+        hashes = np.concatenate([f[0] for f in self.fingerprints])
+        starts = np.concatenate([f[1] for f in self.fingerprints])
+        ends = np.concatenate([f[2] for f in self.fingerprints])
+        docs = np.repeat(np.arange(len(self.fingerprints), dtype=np.int64), counts)
+
+        order = np.argsort(hashes, kind="stable")
+        hashes = hashes[order]
+        bounds = np.flatnonzero(np.r_[True, hashes[1:] != hashes[:-1], True])
+        sizes = np.diff(bounds)
+        keep = (sizes >= 2) & (sizes <= self.max_doc_freq)
+
+        left, right = [], []
+        # Pairs of entries inside each shared fingerprint group
+        for size in np.unique(sizes[keep]):
+            group_starts = bounds[:-1][keep & (sizes == size)]
+            iu, ju = np.triu_indices(size, 1)
+            left.append((group_starts[:, None] + iu).ravel())
+            right.append((group_starts[:, None] + ju).ravel())
+        if not left:
+            return None
+        a = order[np.concatenate(left)]
+        b = order[np.concatenate(right)]
+
+        cross = docs[a] != docs[b]
+        a, b = a[cross], b[cross]
+        # doc1 is the document with the smaller path, whatever order documents arrived in
+        rank = np.empty(len(self.paths), dtype=np.int64)
+        rank[np.argsort(np.array(self.paths, dtype=object), kind="stable")] = np.arange(len(self.paths))
+        swap = rank[docs[a]] > rank[docs[b]]
+        a, b = np.where(swap, b, a), np.where(swap, a, b)
+        return docs[a], docs[b], starts[a], ends[a], starts[b], ends[b]
+
+    def find_reused_passages(self):
+        """Return reused passages as dicts with doc1/start1/end1, doc2/start2/end2, length."""
+        self.logger.info("Detecting reused passages with winnowing fingerprints...")
+        matches = self._matches()
+        passages = []
+        if matches is None:
+            self.logger.success("Detected 0 reused passages.")
+            return passages
+
+        d1, d2, s1, e1, s2, e2 = matches
+        order = np.lexsort((s2, s1, d2, d1))
+        gap = self.max_gap
+        current = None
+        for i in order.tolist():
+            row = (int(d1[i]), int(d2[i]), int(s1[i]), int(e1[i]), int(s2[i]), int(e2[i]))
+            if (
+                current is not None
+                and current[0] == row[0] and current[1] == row[1]
+                and row[2] <= current[3] + gap
+                and current[4] - gap <= row[4] <= current[5] + gap
+            ):
+                current[3] = max(current[3], row[3])
+                current[5] = max(current[5], row[5])
+                current[6] += 1
+                continue
+            self._emit(current, passages)
+            current = list(row) + [1]
+        self._emit(current, passages)
+        passages.sort(key=lambda p: (p["doc1"], p["doc2"], p["start1"], p["start2"]))
+
+        self.logger.success(f"Detected {len(passages)} reused passages.")
+        return passages
+
+    def _emit(self, current, passages):
+        if current is None or current[6] < self.min_matches:
+            return
+        d1, d2, s1, e1, s2, e2, _ = current
+        if self.paths[d1] == self.paths[d2]:
+            return  # the same file added twice is not reuse
+        passages.append({
+            "doc1": self.paths[d1],
+            "start1": s1,
+            "end1": e1,
+            "doc2": self.paths[d2],
+            "start2": s2,
+            "end2": e2,
+            "length": e1 - s1,
+        })
+
+    def pair_summaries(self, passages):
+        """Collapse passages into one duplicates row per document pair.
+
+        Similarity is the reused share of the shorter document (in characters).
+        A document is never paired with itself."""
+        lengths = {path: f[3] for path, f in zip(self.paths, self.fingerprints)}
+        reused = {}
+        for p in passages:
+            if p["doc1"] == p["doc2"]:
+                continue
+            pair = (p["doc1"], p["doc2"]) if p["doc1"] < p["doc2"] else (p["doc2"], p["doc1"])
+            reused[pair] = reused.get(pair, 0) + p["length"]
+        return [
+            {
+                "doc1": d1,
+                "doc2": d2,
+                "similarity": round(min(1.0, total / max(1, min(lengths[d1], lengths[d2]))), 3),
+                "kind": "segment",
+            }
+            for (d1, d2), total in reused.items()
+        ]
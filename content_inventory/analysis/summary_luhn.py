@@ -1,14 +1,134 @@
 import re
 import string
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import sent_tokenize, word_tokenize
-from heapq import nlargest
+from nltk.tokenize import word_tokenize
+from heapq import nlargest, heappush, heappushpop
+from content_inventory.analysis.nlp_resources import get_resources
+from content_inventory.analysis.annotation import Annotation
+
+
+# Inline global flags such as (?i) at the start of a pattern
+_LEADING_FLAGS = re.compile(r"\(\?([aiLmsux]+)\)")
+_CONDITIONAL_REF = re.compile(r"\(\?\((\d+)\)")
+_OCTAL_ESCAPE = re.compile(r"0[0-7]{0,2}|[0-7]{3}")
+_BACKREF = re.compile(r"[1-9]\d?")
+
+
+def _rewrite_pattern(pattern, group_offset=0):
+    """Rewrite one boilerplate pattern so it keeps its meaning inside the combined alternation.
+
+    Leading global flags become a scoped group ((?i)x -> (?i:x)), numbered
+    backreferences are shifted past the groups of earlier patterns, and each
+    unescaped literal space outside a character class matches any run of
+    whitespace (except in verbose patterns, where spaces are ignored)."""
+    flags = ""
+    while True:
+        m = _LEADING_FLAGS.match(pattern)
+        if m is None:
+            break
+        flags += m.group(1)
+        pattern = pattern[m.end():]
+    verbose = "x" in flags
+
+    out = []
+    i = 0
+    in_class = False
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            octal = _OCTAL_ESCAPE.match(pattern, i + 1)
+            m = None if in_class or octal else _BACKREF.match(pattern, i + 1)
+            if m is None:
+                out.append(pattern[i:i + 2])
+                i += 2
+                continue
+            group = int(m.group()) + group_offset
+            if group > 99:
+                raise re.error("too many capturing groups before this backreference")
+            out.append(f"(?:\\{group})")
+            i = m.end()
+            continue
+        if in_class:
+            if c == "]":
+                in_class = False
+        elif c == "[":
+            # A ] right after [ or [^ is a literal member of the class
+            j = i + 1
+            if pattern.startswith("^", j):
+                j += 1
+            if pattern.startswith("]", j):
+                j += 1
+            out.append(pattern[i:j])
+            i = j
+            in_class = True
+            continue
+        elif c == " " and not verbose:
+            out.append(r"\s+")
+            i += 1
+            continue
+        elif c == "(":
+            m = _CONDITIONAL_REF.match(pattern, i)
+            if m is not None:
+                out.append(f"(?({int(m.group(1)) + group_offset})")
+                i = m.end()
+                continue
+        out.append(c)
+        i += 1
+
+    body = "".join(out)
+    return f"(?{flags}:{body})" if flags else f"(?:{body})"
+
+
+def combine_patterns(patterns, labels=None):
+    """Join boilerplate patterns into the source of one alternation.
+
+    Each pattern is validated as it will appear in the combined regex; an
+    invalid one raises ValueError naming its label (e.g. file:line)."""
+    labels = labels or [f"pattern {n}" for n in range(1, len(patterns) + 1)]
+    parts = []
+    offset = 0
+    names = {}
+    for pattern, label in zip(patterns, labels):
+        try:
+            compiled = re.compile(_rewrite_pattern(pattern), re.IGNORECASE | re.DOTALL)
+            parts.append(_rewrite_pattern(pattern, offset))
+        except re.error as e:
+            raise ValueError(f"{label}: invalid pattern {pattern!r}: {e}") from e
+        for name in compiled.groupindex:
+            if name in names:
+                raise ValueError(f"{label}: group name {name!r} is already used by {names[name]}")
+            names[name] = label
+        offset += compiled.groups
+    combined = "|".join(parts)
+    try:
+        re.compile(combined, re.IGNORECASE | re.DOTALL)
+    except re.error as e:
+        raise ValueError(f"boilerplate patterns cannot be combined: {e}") from e
+    return combined
+
+
+def load_patterns(path):
+    """Read boilerplate regexes from a file: one per line, blank lines and # comments ignored.
+
+    Raises ValueError naming the line of an invalid pattern."""
+    patterns = []
+    labels = []
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            patterns.append(line)
+            labels.append(f"{path}:{lineno}")
+    combine_patterns(patterns, labels)
+    return patterns
 
 
 class LuhnSummarizer:
     """Improved Luhn-based summarizer tuned for procedural and policy documents."""
 
+    # Bump when scoring or filtering changes so cached summaries are invalidated
+    VERSION = "3"
+
     BOILERPLATE_PATTERNS = [
         r'continued on next page',
         r'summary of document changes',
@@ -28,65 +148,155 @@ class LuhnSummarizer:
         r'overview, continued',
     ]
 
-    def __init__(self, logger, max_sentences=7):
+    # Patterns loaded with set_extra_patterns(), applied after the defaults
+    extra_patterns = ()
+    _boilerplate_re = None
+    # Case-sensitive variant matched against lowercased text (None if a pattern has capitals)
+    _boilerplate_folded_re = None
+
+    HEADING_RE = re.compile(r"(table|appendix|figure|continued|copyright)", re.I)
+
+    # Sentences (as token tuples) remembered by the verb check
+    VERB_CACHE_SIZE = 100_000
+
+    def __init__(self, logger, max_sentences=7, resources=None):
         self.logger = logger
         self.max_sentences = max_sentences
-        nltk.download("punkt", quiet=True)
-        nltk.download("stopwords", quiet=True)
-        nltk.download("averaged_perceptron_tagger", quiet=True)
-        self.stop_words = set(stopwords.words("english"))
+        self.resources = resources or get_resources()
+        self.stop_words = self.resources.stop_words
+        self._verb_cache = {}
+
+    # --------------------------------------------------------------
+    # Boilerplate patterns
+    # --------------------------------------------------------------
+    @classmethod
+    def boilerplate_patterns(cls):
+        return list(cls.BOILERPLATE_PATTERNS) + list(cls.extra_patterns)
+
+    @classmethod
+    def boilerplate_regex(cls):
+        """All boilerplate patterns compiled into one alternation (compiled once per process).
+
+        An unescaped literal space in a pattern matches any run of whitespace,
+        so the text does not need to be collapsed before matching; write "\\ "
+        for exactly one space."""
+        if cls._boilerplate_re is None:
+            patterns = cls.boilerplate_patterns()
+            combined = combine_patterns(patterns)
+            cls._boilerplate_re = re.compile(combined, re.IGNORECASE | re.DOTALL)
+            # Matching lowercased text case-sensitively is about twice as fast as IGNORECASE
+            if all(p == p.lower() for p in patterns):
+                cls._boilerplate_folded_re = re.compile(combined, re.DOTALL)
+            else:
+                cls._boilerplate_folded_re = None
+        return cls._boilerplate_re
+
+    @classmethod
+    def set_extra_patterns(cls, patterns):
+        """Add user patterns to the defaults; raises ValueError if one is invalid."""
+        patterns = tuple(patterns)
+        labels = [f"pattern {n}" for n in range(1, len(cls.BOILERPLATE_PATTERNS) + 1)]
+        labels += [f"extra pattern {n}" for n in range(1, len(patterns) + 1)]
+        combine_patterns(list(cls.BOILERPLATE_PATTERNS) + list(patterns), labels)
+        cls.extra_patterns = patterns
+        cls._boilerplate_re = None
+        cls.boilerplate_regex()
 
     # --------------------------------------------------------------
     # Cleaning utilities
     # --------------------------------------------------------------
-    def _clean_boilerplate(self, text):
+    @classmethod
+    def clean_boilerplate(cls, text):
         """Remove metadata, headings, and repeated procedural boilerplate."""
-        text = re.sub(r"\s+", " ", text)
-        for pat in self.BOILERPLATE_PATTERNS:
-            text = re.sub(pat, " ", text, flags=re.IGNORECASE)
-        text = re.sub(r"\s+", " ", text)
-        return text.strip()
+        regex = cls.boilerplate_regex()
+        folded = cls._boilerplate_folded_re
+        lowered = text.lower()
+        if folded is None or len(lowered) != len(text):
+            return " ".join(regex.sub(" ", text).split())
+
+        # One pass for every pattern; matches found in the lowercased copy are
+        # cut from the original, so the summary keeps its casing
+        pieces = []
+        last = 0
+        for match in folded.finditer(lowered):
+            pieces.append(text[last:match.start()])
+            last = match.end()
+        if not pieces:
+            return " ".join(text.split())
+        pieces.append(text[last:])
+        return " ".join(" ".join(pieces).split())
+
+    def _has_verb(self, words, tagged):
+        """True if the POS tags contain a verb; repeated sentences are answered from a cache."""
+        key = tuple(words)
+        has_verb = self._verb_cache.get(key)
+        if has_verb is None:
+            if len(self._verb_cache) >= self.VERB_CACHE_SIZE:
+                self._verb_cache.clear()
+            has_verb = self._verb_cache[key] = any(tag.startswith("VB") for _, tag in tagged())
+        return has_verb
+
+    def _is_informative(self, sentence, words, tagged):
+        """Return True if the sentence is likely to contain useful information.
 
-    def _is_informative(self, sentence):
-        """Return True if the sentence is likely to contain useful information."""
-        words = word_tokenize(sentence)
+        tagged is called for the POS tags only once the cheaper checks pass."""
         # Ignore short, list-like, or table-style sentences
         if len(words) < 8 or len(words) > 40:
             return False
-        # Must contain a verb
-        tags = nltk.pos_tag(words)
-        if not any(tag.startswith("VB") for _, tag in tags):
-            return False
         # Skip headings or repeated patterns
-        if re.search(r"(table|appendix|figure|continued|copyright)", sentence, re.I):
+        if self.HEADING_RE.search(sentence):
             return False
-        return True
+        # Must contain a verb
+        return self._has_verb(words, tagged)
 
     # --------------------------------------------------------------
     # Core summarization
     # --------------------------------------------------------------
-    def summarize(self, text):
-        """Generate a 7-sentence readable summary paragraph."""
+    def _clean_sentences(self, annotation):
+        """Yield (clean sentence, tokens, tag callable) for each annotated sentence.
+
+        Boilerplate is removed per sentence; the shared tokens and tags are reused
+        unless cleaning changed more than whitespace."""
+        for i, sent in enumerate(annotation.sentences):
+            clean = self.clean_boilerplate(sent)
+            if not clean:
+                continue
+            if clean == " ".join(sent.split()):
+                yield clean, annotation.tokens[i], (lambda i=i: annotation.tagged(i))
+            else:
+                tokens = word_tokenize(clean, preserve_line=True)
+                yield clean, tokens, (lambda tokens=tokens: self.resources.pos_tag(tokens))
+
+    def summarize(self, text, annotation=None):
+        """Generate a 7-sentence readable summary paragraph.
+
+        annotation is the document's shared Annotation; it is built here if not given."""
         if not text or len(text.split()) < 50:
             return text.strip()
 
-        clean_text = self._clean_boilerplate(text)
-        sentences = [s.strip() for s in sent_tokenize(clean_text) if self._is_informative(s)]
+        if annotation is None:
+            annotation = Annotation(text, self.resources)
+
+        clean_sentences = []
+        sentences = []
+        freq = {}
+        for sent, tokens, tagged in self._clean_sentences(annotation):
+            clean_sentences.append(sent)
+            words = [w.lower() for w in tokens]
+            if self._is_informative(sent, tokens, tagged):
+                sentences.append((sent, words))
+            for word in words:
+                if word not in self.stop_words and word not in string.punctuation:
+                    freq[word] = freq.get(word, 0) + 1
 
         # Fallback if filtering removed everything
         if not sentences:
             self.logger.debug("No informative sentences found; using fallback summary.")
-            raw = " ".join(sent_tokenize(clean_text)[:3])
+            raw = " ".join(clean_sentences[:3])
             return self._finalize_summary(raw)
 
-        words = word_tokenize(clean_text.lower())
-        freq = {}
-        for word in words:
-            if word not in self.stop_words and word not in string.punctuation:
-                freq[word] = freq.get(word, 0) + 1
-
         if not freq:
-            return self._finalize_summary(" ".join(sentences[:self.max_sentences]))
+            return self._finalize_summary(" ".join(s for s, _ in sentences[:self.max_sentences]))
 
         max_freq = max(freq.values())
         for w in freq:
@@ -94,8 +304,7 @@ class LuhnSummarizer:
 
         # Score informative sentences by average term frequency
         sentence_scores = {}
-        for sent in sentences:
-            sent_words = word_tokenize(sent.lower())
+        for sent, sent_words in sentences:
             score = sum(freq.get(w, 0) for w in sent_words)
             if score > 0:
                 sentence_scores[sent] = score / len(sent_words)
@@ -104,10 +313,55 @@ class LuhnSummarizer:
         top_sents = nlargest(self.max_sentences, sentence_scores, key=sentence_scores.get)
 
         # Preserve original order for readability
-        ordered = [s for s in sentences if s in top_sents]
+        ordered = [s for s, _ in sentences if s in top_sents]
         summary = " ".join(ordered[:self.max_sentences])
         return self._finalize_summary(summary)
 
+    def summarize_windows(self, annotations, max_candidates=100):
+        """Summarize a large document given as an iterable of window Annotations.
+
+        Term frequencies are accumulated as windows arrive and only the
+        max_candidates best informative sentences (scored against the running
+        frequencies) are kept in a heap; they are rescored with the final
+        frequencies at the end. Memory is bounded by the vocabulary and the
+        heap, not by the length of the document."""
+        freq = {}
+        max_freq = 0
+        candidates = []  # min-heap of (running score, position, sentence, words)
+        fallback = []
+        position = 0
+        for annotation in annotations:
+            for sent, tokens, tagged in self._clean_sentences(annotation):
+                if len(fallback) < 3:
+                    fallback.append(sent)
+                words = [w.lower() for w in tokens]
+                for word in words:
+                    if word not in self.stop_words and word not in string.punctuation:
+                        count = freq[word] = freq.get(word, 0) + 1
+                        max_freq = max(max_freq, count)
+                if not self._is_informative(sent, tokens, tagged) or not max_freq:
+                    continue
+                score = sum(freq.get(w, 0) for w in words) / (len(words) * max_freq)
+                entry = (score, position, sent, words)
+                position += 1
+                if len(candidates) < max_candidates:
+                    heappush(candidates, entry)
+                elif score > candidates[0][0]:
+                    heappushpop(candidates, entry)
+
+        if not candidates:
+            self.logger.debug("No informative sentences found; using fallback summary.")
+            return self._finalize_summary(" ".join(fallback))
+
+        # Final scores use the frequencies of the whole document
+        rescored = [
+            (sum(freq.get(w, 0) for w in words) / len(words), pos, sent)
+            for _, pos, sent, words in candidates
+        ]
+        top = nlargest(self.max_sentences, rescored)
+        ordered = [sent for _, _, sent in sorted(top, key=lambda t: t[1])]
+        return self._finalize_summary(" ".join(ordered))
+
     # --------------------------------------------------------------
     # Post-processing for readability
     # --------------------------------------------------------------
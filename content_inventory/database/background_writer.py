@@ -0,0 +1,69 @@
+# content_inventory/database/background_writer.py
+import queue
+import threading
+
+_STOP = object()
+
+
+class BackgroundWriter:
+    """Runs Repository writes on a dedicated thread so ingestion never waits on SQLite.
+
+    Calls are queued in order; close() drains the queue, builds indexes, and
+    closes the repository. An error raised on the writer thread is re-raised by close()."""
+
+    def __init__(self, repo, logger, max_queue=10000):
+        self.repo = repo
+        self.logger = logger
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.error = None
+        self.thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                break
+            if self.error is not None:
+                continue  # keep draining so producers never block on a dead writer
+            method, args = item
+            try:
+                getattr(self.repo, method)(*args)
+            except Exception as e:
+                self.error = e
+                self.logger.error(f"Database writer failed in {method}: {e}")
+
+    def _submit(self, method, *args):
+        if self.error is not None:
+            raise self.error
+        self.queue.put((method, args))
+
+    def insert_document(self, doc):
+        # Snapshot without the text: the caller may release fields once this returns
+        self._submit("insert_document", {k: v for k, v in doc.items() if k != "text"})
+
+    def delete_missing(self, live_paths):
+        self._submit("delete_missing", live_paths)
+
+    def insert_entities(self, entities):
+        self._submit("insert_entities", entities)
+
+    def insert_duplicates(self, duplicates):
+        self._submit("insert_duplicates", duplicates)
+
+    def insert_clusters(self, clusters):
+        self._submit("insert_clusters", clusters)
+
+    def insert_passages(self, passages):
+        self._submit("insert_passages", passages)
+
+    def close(self):
+        if self.error is None:
+            self.queue.put(("commit", ()))
+            self.queue.put(("create_indexes", ()))
+        self.queue.put(_STOP)
+        self.thread.join()
+        if self.error is not None:
+            self.repo.conn.close()
+            raise self.error
+        self.repo.close()
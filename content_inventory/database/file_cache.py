@@ -0,0 +1,224 @@
+# content_inventory/database/file_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+from collections import Counter
+
+import numpy as np
+
+from content_inventory.analysis.summary_luhn import LuhnSummarizer
+from content_inventory.analysis.entity_extractor import EntityExtractor
+from content_inventory.analysis.duplicate_detector import DuplicateDetector
+from content_inventory.analysis.document_analyzer import DocumentAnalyzer
+from content_inventory.analysis.segment_reuse import SegmentReuseDetector, pack_segments, unpack_segments
+from content_inventory.ingestion.parsers.pdf_parser import PDFParser
+from content_inventory.ingestion.parsers.docx_parser import DocxParser
+from content_inventory.ingestion.parsers import registry
+
+
+def cache_version():
+    """Stamp identifying the analysis settings that produced a cache entry.
+
+    Any change to the summarizer or its large-document settings, the parser
+    registry, PDF or DOCX text extraction mode, noun phrase grammar, MinHash size, or winnowing parameters
+    yields a different stamp, so older entries are treated as misses."""
+    parts = [
+        LuhnSummarizer.VERSION,
+        repr(LuhnSummarizer.boilerplate_patterns()),
+        repr(sorted(DocumentAnalyzer.settings().items())),
+        EntityExtractor.VERSION,
+        EntityExtractor.GRAMMAR,
+        str(DuplicateDetector.NUM_PERM),
+        np.dtype(DuplicateDetector.SIGNATURE_DTYPE).name,
+        f"{SegmentReuseDetector.K}:{SegmentReuseDetector.WINDOW}:{SegmentReuseDetector.FORMAT}",
+        f"{PDFParser.text_only}:{sorted(PDFParser.laparams.items())}",
+        repr(sorted(DocxParser.settings().items())),
+        repr([(spec.parser_cls.__name__, spec.extensions) for spec in registry.registered_specs()]),
+    ]
+    return hashlib.sha1("|".join(parts).encode("utf8")).hexdigest()[:16]
+
+
+def hash_file(path, block_size=1 << 20):
+    """Return the SHA-256 hex digest of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class FileCache:
+    """Persistent per-file analysis cache used to skip unchanged files on re-runs.
+
+    Entries are keyed by path and matched on size + mtime; when only the mtime
+    differs the file's content hash is compared before the entry is reused.
+    With require_segments, entries stored without winnowing fingerprints are
+    treated as misses."""
+
+    # Bump when the table layout changes (2: segment fingerprints)
+    SCHEMA_VERSION = 2
+
+    def __init__(self, db_path, logger, require_segments=False):
+        self.logger = logger
+        self.require_segments = require_segments
+        self.version = cache_version()
+        self.conn = sqlite3.connect(db_path)
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        # path -> (size, mtime) observed before parsing, used when storing results
+        self._pending = {}
+        self.create_tables()
+
+    def create_tables(self):
+        (user_version,) = self.conn.execute("PRAGMA user_version").fetchone()
+        if user_version < self.SCHEMA_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS file_cache")
+            self.conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+        self.conn.executescript("""
+        CREATE TABLE IF NOT EXISTS file_cache (
+            path TEXT PRIMARY KEY,
+            size INTEGER,
+            mtime REAL,
+            content_hash TEXT,
+            text_digest TEXT,
+            filename TEXT,
+            summary TEXT,
+            word_count INTEGER,
+            sentiment TEXT,
+            entities TEXT,
+            signature BLOB,
+            segments BLOB,
+            version TEXT
+        );
+        """)
+        cursor = self.conn.execute("DELETE FROM file_cache WHERE version != ?", (self.version,))
+        self.conn.commit()
+        if cursor.rowcount:
+            self.logger.info(f"Invalidated {cursor.rowcount} cache entries from an older analysis version.")
+
+    # --------------------------------------------------------------
+    # Lookup
+    # --------------------------------------------------------------
+    def lookup(self, path, stat=None):
+        """Return the cached document for path, or None if it must be re-processed.
+
+        stat is the file's (size, mtime) if the caller has just read it."""
+        if stat is None:
+            try:
+                st = os.stat(path)
+            except OSError:
+                return None
+            stat = (st.st_size, st.st_mtime)
+        size, mtime = self._pending[path] = stat
+
+        row = self.conn.execute(
+            "SELECT size, mtime, content_hash, text_digest, filename, summary, word_count, "
+            "sentiment, entities, signature, segments FROM file_cache WHERE path = ?",
+            (path,)
+        ).fetchone()
+        if row is None or row[0] != size:
+            return None
+        if self.require_segments and row[10] is None:
+            return None
+
+        if row[1] != mtime:
+            # Touched but possibly unchanged: fall back to the content hash
+            if hash_file(path) != row[2]:
+                return None
+            self.conn.execute("UPDATE file_cache SET mtime = ? WHERE path = ?", (mtime, path))
+
+        doc = {
+            "filename": row[4],
+            "path": path,
+            "text": "",
+            "summary": row[5],
+            "word_count": row[6],
+            "sentiment": json.loads(row[7]),
+            "entities": Counter(json.loads(row[8])),
+            "signature": np.frombuffer(row[9], dtype=DuplicateDetector.SIGNATURE_DTYPE),
+            "text_digest": row[3],
+            "content_hash": row[2],
+            "cached": True,
+        }
+        if row[10] is not None:
+            doc["segments"] = unpack_segments(row[10])
+        return doc
+
+    def partition(self, filepaths, stats=None):
+        """Split filepaths into (cached documents, paths that need parsing).
+
+        stats optionally maps paths to a freshly read (size, mtime)."""
+        stats = stats or {}
+        cached, pending = [], []
+        for path in filepaths:
+            doc = self.lookup(path, stats.get(path))
+            if doc is None:
+                pending.append(path)
+            else:
+                cached.append(doc)
+        self.conn.commit()
+        self.hits += len(cached)
+        self.misses += len(pending)
+        self.logger.info(f"Cache: {len(cached)} unchanged files reused, {len(pending)} to process.")
+        return cached, pending
+
+    # --------------------------------------------------------------
+    # Store and evict
+    # --------------------------------------------------------------
+    def store(self, doc):
+        """Record a freshly analyzed document (after entity extraction and fingerprinting).
+
+        Documents marked with a parse error are not stored, so a transient
+        failure is retried on the next run instead of replayed as empty."""
+        path = doc["path"]
+        stat = self._pending.pop(path, None)
+        if doc.get("cached") or doc.get("error"):
+            return
+        try:
+            if stat is None:
+                st = os.stat(path)
+                stat = (st.st_size, st.st_mtime)
+            # Workers that fingerprint documents hash them too
+            content_hash = doc.get("content_hash") or hash_file(path)
+        except OSError as e:
+            self.logger.warn(f"Could not cache {path}: {e}")
+            return
+        doc["content_hash"] = content_hash
+
+        text_digest = doc.get("text_digest") or hashlib.sha256(doc.get("text", "").encode("utf8")).hexdigest()
+        signature = np.asarray(doc["signature"], dtype=DuplicateDetector.SIGNATURE_DTYPE)
+        segments = doc.get("segments")
+        self.conn.execute(
+            "INSERT OR REPLACE INTO file_cache (path, size, mtime, content_hash, text_digest, filename, "
+            "summary, word_count, sentiment, entities, signature, segments, version) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                path, stat[0], stat[1], content_hash, text_digest, doc["filename"],
+                doc["summary"], doc["word_count"], json.dumps(doc["sentiment"]),
+                json.dumps(doc["entities"]), signature.tobytes(),
+                None if segments is None else pack_segments(segments), self.version,
+            )
+        )
+        self.stored += 1
+
+    def commit(self):
+        self.conn.commit()
+        self.logger.info(f"Cache: stored {self.stored} new or changed files.")
+
+    def evict_missing(self, live_paths):
+        """Delete entries for files that are no longer part of the corpus."""
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS live_paths (path TEXT PRIMARY KEY)")
+        self.conn.execute("DELETE FROM live_paths")
+        self.conn.executemany("INSERT OR IGNORE INTO live_paths (path) VALUES (?)", ((p,) for p in live_paths))
+        cursor = self.conn.execute(
+            "DELETE FROM file_cache WHERE path NOT IN (SELECT path FROM live_paths)"
+        )
+        self.conn.commit()
+        if cursor.rowcount:
+            self.logger.info(f"Cache: evicted {cursor.rowcount} entries for deleted files.")
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,131 @@
+# content_inventory/database/lsh_index.py
+import sqlite3
+import numpy as np
+from datasketch import MinHashLSH
+
+
+class PersistentLSH:
+    """MinHash LSH band tables, signatures, and detected pairs kept in SQLite.
+
+    Band/row parameters are taken from datasketch.MinHashLSH for the same
+    threshold and num_perm, so candidate selection matches the in-memory index.
+    Entries are updated in place: removing or inserting a key only touches that
+    key's rows, which makes nightly runs proportional to the changed files."""
+
+    # Bump when the layout of stored keys or pairs changes
+    # (2: canonical doc1 < doc2 pairs, 3: documents keyed by path instead of file name,
+    #  4: only pairs at or above the threshold are stored)
+    FORMAT = 4
+
+    def __init__(self, db_path, logger, threshold=0.8, num_perm=128, signature_dtype=np.uint32):
+        self.logger = logger
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.signature_dtype = signature_dtype
+        params = MinHashLSH(threshold=threshold, num_perm=num_perm)
+        self.b, self.r = params.b, params.r
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.create_tables()
+
+    def create_tables(self):
+        self.conn.executescript("""
+        CREATE TABLE IF NOT EXISTS lsh_meta (
+            name TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE TABLE IF NOT EXISTS lsh_signatures (
+            key TEXT PRIMARY KEY,
+            signature BLOB
+        );
+        CREATE TABLE IF NOT EXISTS lsh_buckets (
+            band INTEGER,
+            bucket BLOB,
+            key TEXT,
+            PRIMARY KEY (band, bucket, key)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_lsh_buckets_key ON lsh_buckets (key);
+        CREATE TABLE IF NOT EXISTS lsh_pairs (
+            doc1 TEXT,
+            doc2 TEXT,
+            similarity REAL,
+            PRIMARY KEY (doc1, doc2)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_lsh_pairs_doc2 ON lsh_pairs (doc2);
+        """)
+
+        meta = (
+            f"{self.FORMAT}:{self.threshold}:{self.num_perm}:{self.b}:{self.r}:"
+            f"{np.dtype(self.signature_dtype).name}"
+        )
+        row = self.conn.execute("SELECT value FROM lsh_meta WHERE name = 'params'").fetchone()
+        if row is not None and row[0] != meta:
+            self.logger.warn("LSH parameters or format changed; rebuilding the persistent index.")
+            self.conn.executescript(
+                "DELETE FROM lsh_signatures; DELETE FROM lsh_buckets; DELETE FROM lsh_pairs;"
+            )
+        self.conn.execute("INSERT OR REPLACE INTO lsh_meta (name, value) VALUES ('params', ?)", (meta,))
+        self.conn.commit()
+
+    def _bands(self, signature):
+        signature = np.asarray(signature, dtype=self.signature_dtype)
+        for band in range(self.b):
+            yield band, signature[band * self.r:(band + 1) * self.r].tobytes()
+
+    # --------------------------------------------------------------
+    # Signatures and band tables
+    # --------------------------------------------------------------
+    def keys(self):
+        return {key for (key,) in self.conn.execute("SELECT key FROM lsh_signatures")}
+
+    def get(self, key):
+        row = self.conn.execute("SELECT signature FROM lsh_signatures WHERE key = ?", (key,)).fetchone()
+        return None if row is None else np.frombuffer(row[0], dtype=self.signature_dtype)
+
+    def insert(self, key, signature):
+        signature = np.asarray(signature, dtype=self.signature_dtype)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO lsh_signatures (key, signature) VALUES (?, ?)",
+            (key, signature.tobytes())
+        )
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO lsh_buckets (band, bucket, key) VALUES (?, ?, ?)",
+            ((band, bucket, key) for band, bucket in self._bands(signature))
+        )
+
+    def remove(self, keys):
+        """Drop keys from the signatures, band tables, and stored pairs."""
+        rows = [(key,) for key in keys]
+        self.conn.executemany("DELETE FROM lsh_signatures WHERE key = ?", rows)
+        self.conn.executemany("DELETE FROM lsh_buckets WHERE key = ?", rows)
+        self.conn.executemany("DELETE FROM lsh_pairs WHERE doc1 = ? OR doc2 = ?", [(k, k) for (k,) in rows])
+
+    def query(self, signature):
+        """Keys sharing at least one band bucket with signature."""
+        candidates = set()
+        for band, bucket in self._bands(signature):
+            candidates.update(
+                key for (key,) in self.conn.execute(
+                    "SELECT key FROM lsh_buckets WHERE band = ? AND bucket = ?", (band, bucket)
+                )
+            )
+        return candidates
+
+    # --------------------------------------------------------------
+    # Detected pairs
+    # --------------------------------------------------------------
+    def add_pairs(self, pairs):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO lsh_pairs (doc1, doc2, similarity) VALUES (?, ?, ?)",
+            pairs
+        )
+
+    def pairs(self):
+        return self.conn.execute("SELECT doc1, doc2, similarity FROM lsh_pairs ORDER BY doc1, doc2")
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
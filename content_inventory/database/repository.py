@@ -2,57 +2,273 @@
 import sqlite3
 
 class Repository:
-    """Handles all database interactions (CRUD) with SQLite."""
+    """Handles all database interactions (CRUD) with SQLite.
 
-    def __init__(self, db_path, logger):
+    Rows are keyed by document identity (path) and written with upserts, so
+    re-running over the same corpus only touches rows whose values changed.
+    Writes are buffered and flushed with executemany; each stage (documents,
+    entities, duplicates) runs in a single transaction."""
+
+    SCHEMA_VERSION = 5
+
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-65536",  # 64 MB page cache
+        "PRAGMA foreign_keys=ON",
+    )
+
+    def __init__(self, db_path, logger, batch_size=1000):
         self.logger = logger
-        self.conn = sqlite3.connect(db_path)
+        self.batch_size = batch_size
+        # The connection may be handed to a BackgroundWriter thread after creation
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        for pragma in self.PRAGMAS:
+            self.conn.execute(pragma)
+        self._documents = []
+        self._changed_paths = []
+        self._entity_rows = []
         self.create_tables()
 
     def create_tables(self):
         cursor = self.conn.cursor()
-        cursor.executescript("""
+        version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        if version < self.SCHEMA_VERSION:
+            # Earlier schemas had no unique keys (v1), stored each pair twice (v2),
+            # had no duplicate kind (v3) or no entity error bounds (v4)
+            existing = cursor.execute(
+                "SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name = 'documents'"
+            ).fetchone()[0]
+            if existing:
+                self.logger.warn("Rebuilding inventory tables from an older schema.")
+            cursor.executescript("""
+            DROP TABLE IF EXISTS document_entities;
+            DROP TABLE IF EXISTS documents;
+            DROP TABLE IF EXISTS entities;
+            DROP TABLE IF EXISTS duplicates;
+            DROP TABLE IF EXISTS duplicate_cluster_members;
+            DROP TABLE IF EXISTS duplicate_clusters;
+            DROP TABLE IF EXISTS reused_passages;
+            """)
+
+        cursor.executescript(f"""
         CREATE TABLE IF NOT EXISTS documents (
             id INTEGER PRIMARY KEY,
+            path TEXT NOT NULL UNIQUE,
             filename TEXT,
+            content_hash TEXT,
             summary TEXT,
             word_count INTEGER,
             sentiment REAL
         );
+        CREATE TABLE IF NOT EXISTS document_entities (
+            document_id INTEGER NOT NULL REFERENCES documents (id) ON DELETE CASCADE,
+            entity TEXT NOT NULL,
+            count INTEGER,
+            PRIMARY KEY (document_id, entity)
+        ) WITHOUT ROWID;
         CREATE TABLE IF NOT EXISTS entities (
-            id INTEGER PRIMARY KEY,
-            entity TEXT,
-            count INTEGER
+            entity TEXT PRIMARY KEY,
+            count INTEGER,
+            error INTEGER NOT NULL DEFAULT 0
         );
         CREATE TABLE IF NOT EXISTS duplicates (
+            doc1 TEXT NOT NULL,
+            doc2 TEXT NOT NULL,
+            similarity REAL,
+            kind TEXT NOT NULL DEFAULT 'document',
+            PRIMARY KEY (doc1, doc2, kind)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS reused_passages (
             id INTEGER PRIMARY KEY,
-            doc1 TEXT,
-            doc2 TEXT,
-            similarity REAL
+            doc1 TEXT NOT NULL,
+            start1 INTEGER,
+            end1 INTEGER,
+            doc2 TEXT NOT NULL,
+            start2 INTEGER,
+            end2 INTEGER,
+            length INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS duplicate_clusters (
+            cluster_id INTEGER PRIMARY KEY,
+            representative TEXT,
+            size INTEGER,
+            max_similarity REAL,
+            min_similarity REAL
         );
+        CREATE TABLE IF NOT EXISTS duplicate_cluster_members (
+            cluster_id INTEGER NOT NULL REFERENCES duplicate_clusters (cluster_id) ON DELETE CASCADE,
+            doc TEXT NOT NULL,
+            PRIMARY KEY (cluster_id, doc)
+        ) WITHOUT ROWID;
+        PRAGMA user_version = {self.SCHEMA_VERSION};
         """)
         self.conn.commit()
         self.logger.info("SQLite tables created or verified.")
 
+    def create_indexes(self):
+        """Build lookup indexes once the bulk load is done (cheaper than maintaining them per row)."""
+        self.conn.executescript("""
+        CREATE INDEX IF NOT EXISTS idx_documents_filename ON documents (filename);
+        CREATE INDEX IF NOT EXISTS idx_document_entities_entity ON document_entities (entity);
+        CREATE INDEX IF NOT EXISTS idx_duplicates_doc2 ON duplicates (doc2);
+        CREATE INDEX IF NOT EXISTS idx_duplicate_cluster_members_doc ON duplicate_cluster_members (doc);
+        CREATE INDEX IF NOT EXISTS idx_reused_passages_docs ON reused_passages (doc1, doc2);
+        """)
+        self.conn.commit()
+        self.logger.info("SQLite indexes created or verified.")
+
+    def _insert_many(self, sql, rows):
+        """Insert rows in batches of batch_size inside the current transaction."""
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self.conn.executemany(sql, batch)
+                batch = []
+        if batch:
+            self.conn.executemany(sql, batch)
+
+    def _delete_absent(self, table, columns, keys):
+        """Delete rows of table whose key columns are not among keys; returns the count."""
+        cols = ", ".join(columns)
+        placeholders = ", ".join("?" for _ in columns)
+        live = f"live_{table}"
+        self.conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS {live} ({cols}, PRIMARY KEY ({cols}))")
+        self.conn.execute(f"DELETE FROM {live}")
+        self._insert_many(f"INSERT OR IGNORE INTO {live} ({cols}) VALUES ({placeholders})", keys)
+        cursor = self.conn.execute(
+            f"DELETE FROM {table} WHERE ({cols}) NOT IN (SELECT {cols} FROM {live})"
+        )
+        return cursor.rowcount
+
+    def _flush_documents(self):
+        if self._documents:
+            self.conn.executemany("""
+                INSERT INTO documents (path, filename, content_hash, summary, word_count, sentiment)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (path) DO UPDATE SET
+                    filename = excluded.filename,
+                    content_hash = excluded.content_hash,
+                    summary = excluded.summary,
+                    word_count = excluded.word_count,
+                    sentiment = excluded.sentiment
+                WHERE documents.content_hash IS NOT excluded.content_hash
+                   OR documents.summary IS NOT excluded.summary
+                   OR documents.word_count IS NOT excluded.word_count
+                   OR documents.sentiment IS NOT excluded.sentiment
+                   OR documents.filename IS NOT excluded.filename
+                """, self._documents)
+            self._documents = []
+
+        if self._changed_paths:
+            # Changed documents drop their previous phrases before the new ones go in
+            self.conn.executemany(
+                "DELETE FROM document_entities WHERE document_id = (SELECT id FROM documents WHERE path = ?)",
+                self._changed_paths
+            )
+            self._changed_paths = []
+
+        if self._entity_rows:
+            self.conn.executemany("""
+                INSERT INTO document_entities (document_id, entity, count)
+                SELECT id, ?, ? FROM documents WHERE path = ?
+                ON CONFLICT (document_id, entity) DO UPDATE SET count = excluded.count
+                WHERE document_entities.count IS NOT excluded.count
+                """, self._entity_rows)
+            self._entity_rows = []
+
     def insert_document(self, doc):
-        self.conn.execute(
-            "INSERT INTO documents (filename, summary, word_count, sentiment) VALUES (?, ?, ?, ?)",
-            (doc['filename'], doc['summary'], doc['word_count'], doc['sentiment']['compound'])
+        """Buffer an upsert of a document and its per-document entity counts.
+
+        Rows are written in batches and committed by commit()."""
+        path = doc['path']
+        self._documents.append((
+            path, doc['filename'], doc.get('content_hash'), doc['summary'],
+            doc['word_count'], doc['sentiment']['compound']
+        ))
+        if not doc.get('cached'):
+            self._changed_paths.append((path,))
+        self._entity_rows.extend(
+            (entity, count, path) for entity, count in (doc.get('entities') or {}).items()
         )
+        if len(self._documents) >= self.batch_size:
+            self._flush_documents()
+
+    def commit(self):
+        """Flush buffered rows and commit the current transaction."""
+        self._flush_documents()
+        self.conn.commit()
+
+    def delete_missing(self, live_paths):
+        """Remove documents (and their entity rows) whose files are no longer in the corpus."""
+        self.commit()
+        deleted = self._delete_absent("documents", ["path"], ((p,) for p in live_paths))
         self.conn.commit()
+        if deleted:
+            self.logger.info(f"Removed {deleted} documents for files that no longer exist.")
 
     def insert_entities(self, entities):
-        for e, c in entities.items():
-            self.conn.execute("INSERT INTO entities (entity, count) VALUES (?, ?)", (e, c))
+        """Upsert corpus-level entity counts and drop entities that no longer occur.
+
+        entities is a Counter or an approximate SpaceSaving counter; for the
+        latter the per-entity overestimation bound is stored in the error column."""
+        self.commit()
+        errors = getattr(entities, "errors", {})
+        self._insert_many("""
+            INSERT INTO entities (entity, count, error) VALUES (?, ?, ?)
+            ON CONFLICT (entity) DO UPDATE SET count = excluded.count, error = excluded.error
+            WHERE entities.count IS NOT excluded.count OR entities.error IS NOT excluded.error
+            """, ((e, c, errors.get(e, 0)) for e, c in entities.items()))
+        self._delete_absent("entities", ["entity"], ((e,) for e in entities))
         self.conn.commit()
 
     def insert_duplicates(self, duplicates):
-        for d in duplicates:
-            self.conn.execute(
-                "INSERT INTO duplicates (doc1, doc2, similarity) VALUES (?, ?, ?)",
-                (d['doc1'], d['doc2'], d['similarity'])
-            )
+        """Upsert duplicate pairs and drop pairs that were not detected in this run.
+
+        A pair can be stored once per kind: 'document' (near-duplicate) and
+        'segment' (shared passages)."""
+        self.commit()
+        self._insert_many("""
+            INSERT INTO duplicates (doc1, doc2, similarity, kind) VALUES (?, ?, ?, ?)
+            ON CONFLICT (doc1, doc2, kind) DO UPDATE SET similarity = excluded.similarity
+            WHERE duplicates.similarity IS NOT excluded.similarity
+            """, ((d['doc1'], d['doc2'], d['similarity'], d.get('kind', 'document')) for d in duplicates))
+        self._delete_absent(
+            "duplicates", ["doc1", "doc2", "kind"],
+            ((d['doc1'], d['doc2'], d.get('kind', 'document')) for d in duplicates)
+        )
+        self.conn.commit()
+
+    def insert_passages(self, passages):
+        """Replace the reused passages (character offsets into each document's text)."""
+        self.commit()
+        self.conn.execute("DELETE FROM reused_passages")
+        self._insert_many(
+            "INSERT INTO reused_passages (doc1, start1, end1, doc2, start2, end2, length) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ((p['doc1'], p['start1'], p['end1'], p['doc2'], p['start2'], p['end2'], p['length'])
+             for p in passages)
+        )
+        self.conn.commit()
+
+    def insert_clusters(self, clusters):
+        """Replace the duplicate clusters (cluster ids are reassigned every run)."""
+        self.commit()
+        self.conn.execute("DELETE FROM duplicate_clusters")
+        self._insert_many(
+            "INSERT INTO duplicate_clusters (cluster_id, representative, size, max_similarity, min_similarity) "
+            "VALUES (?, ?, ?, ?, ?)",
+            ((c['cluster_id'], c['representative'], c['size'], c['max_similarity'], c['min_similarity'])
+             for c in clusters)
+        )
+        self._insert_many(
+            "INSERT INTO duplicate_cluster_members (cluster_id, doc) VALUES (?, ?)",
+            ((c['cluster_id'], member) for c in clusters for member in c['members'])
+        )
         self.conn.commit()
 
     def close(self):
-        self.conn.close()
\ No newline at end of file
+        self.commit()
+        self.conn.close()
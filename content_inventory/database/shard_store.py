@@ -0,0 +1,144 @@
+import json
+import sqlite3
+from collections import Counter
+
+import numpy as np
+
+from content_inventory.analysis.duplicate_detector import DuplicateDetector
+from content_inventory.analysis.segment_reuse import pack_segments, unpack_segments
+from content_inventory.database.file_cache import cache_version
+
+
+class ShardStore:
+    """Self-contained partial result of one shard of a sharded run (shard.db).
+
+    Holds everything the merge step needs without the source files: each
+    document's inventory fields, per-document entity counts, MinHash signature
+    and passage fingerprints, plus the shard's entity totals, quarantined
+    files and metadata (shard i/N, source, analysis stamp). Opening a store
+    for writing replaces any previous contents."""
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, db_path, logger, write=False, batch_size=1000):
+        self.db_path = db_path
+        self.logger = logger
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(db_path)
+        self._documents = []
+        self.count = 0
+        if write:
+            self.create_tables()
+
+    def create_tables(self):
+        self.conn.executescript("""
+        DROP TABLE IF EXISTS meta;
+        DROP TABLE IF EXISTS documents;
+        DROP TABLE IF EXISTS entities;
+        DROP TABLE IF EXISTS quarantine;
+        CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+        CREATE TABLE documents (
+            path TEXT PRIMARY KEY,
+            filename TEXT NOT NULL,
+            content_hash TEXT,
+            summary TEXT,
+            word_count INTEGER,
+            sentiment TEXT,
+            entities TEXT,
+            signature BLOB NOT NULL,
+            segments BLOB
+        );
+        CREATE TABLE entities (entity TEXT PRIMARY KEY, count INTEGER NOT NULL, error INTEGER NOT NULL);
+        CREATE TABLE quarantine (path TEXT PRIMARY KEY, reason TEXT);
+        """)
+        self.conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        self.conn.commit()
+
+    # --------------------------------------------------------------
+    # Writing (one shard run)
+    # --------------------------------------------------------------
+    def write_meta(self, index, count, source, segments):
+        rows = {
+            "shard": f"{index}/{count}",
+            "source": source,
+            "version": cache_version(),
+            "segments": "1" if segments else "0",
+        }
+        self.conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", rows.items())
+
+    def add_document(self, doc):
+        """Buffer one analyzed document (with entities, signature and optional segments)."""
+        segments = doc.get("segments")
+        signature = np.asarray(doc["signature"], dtype=DuplicateDetector.SIGNATURE_DTYPE)
+        self._documents.append((
+            doc["path"], doc["filename"], doc.get("content_hash"), doc["summary"], doc["word_count"],
+            json.dumps(doc["sentiment"]), json.dumps(doc.get("entities") or {}), signature.tobytes(),
+            None if segments is None else pack_segments(segments),
+        ))
+        self.count += 1
+        if len(self._documents) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO documents (path, filename, content_hash, summary, word_count, "
+            "sentiment, entities, signature, segments) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            self._documents
+        )
+        self._documents = []
+
+    def write_entities(self, entities):
+        """Store the shard's corpus-level entity counter (exact or Space-Saving)."""
+        errors = getattr(entities, "errors", {})
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO entities (entity, count, error) VALUES (?, ?, ?)",
+            ((e, c, errors.get(e, 0)) for e, c in entities.items())
+        )
+
+    def write_quarantine(self, quarantined):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO quarantine (path, reason) VALUES (?, ?)",
+            ((q["path"], q["reason"]) for q in quarantined)
+        )
+
+    def close(self):
+        if self._documents:
+            self._flush()
+        self.conn.commit()
+        self.conn.close()
+
+    # --------------------------------------------------------------
+    # Reading (merge)
+    # --------------------------------------------------------------
+    def meta(self):
+        (user_version,) = self.conn.execute("PRAGMA user_version").fetchone()
+        if user_version != self.SCHEMA_VERSION:
+            raise ValueError(f"{self.db_path} is not a shard artifact of this version")
+        return dict(self.conn.execute("SELECT key, value FROM meta"))
+
+    def iter_documents(self):
+        """Yield the shard's documents in path order, shaped like parsed documents."""
+        rows = self.conn.execute(
+            "SELECT path, filename, content_hash, summary, word_count, sentiment, entities, "
+            "signature, segments FROM documents ORDER BY path"
+        )
+        for row in rows:
+            doc = {
+                "filename": row[1],
+                "path": row[0],
+                "text": "",
+                "summary": row[3],
+                "word_count": row[4],
+                "sentiment": json.loads(row[5]),
+                "entities": Counter(json.loads(row[6])),
+                "signature": np.frombuffer(row[7], dtype=DuplicateDetector.SIGNATURE_DTYPE),
+            }
+            if row[2] is not None:
+                doc["content_hash"] = row[2]
+            if row[8] is not None:
+                doc["segments"] = unpack_segments(row[8])
+            yield doc
+
+    def quarantined(self):
+        rows = self.conn.execute("SELECT path, reason FROM quarantine ORDER BY path")
+        return [{"path": path, "reason": reason} for path, reason in rows]
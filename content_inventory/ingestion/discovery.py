@@ -0,0 +1,141 @@
+import csv
+import fnmatch
+import hashlib
+import os
+import re
+from content_inventory.ingestion.parsers import registry
+
+MANIFEST_FIELDS = ("path", "size", "mtime", "inode")
+
+
+def _glob_regex(patterns):
+    """One compiled regex matching any of the glob patterns, or None if there are none."""
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in patterns))
+
+
+def shard_of(path, root, count):
+    """Shard (0..count-1) of a file, from a hash of its path relative to root.
+
+    Relative paths keep the assignment stable across nodes that mount the
+    same tree in different places."""
+    rel = os.path.relpath(path, root).replace(os.sep, "/")
+    return int.from_bytes(hashlib.sha1(rel.encode("utf8")).digest()[:8], "big") % count
+
+
+def select_shard(entries, root, index, count):
+    """The entries that belong to shard index of count."""
+    return [e for e in entries if shard_of(e["path"], root, count) == index]
+
+
+class FileDiscovery:
+    """Finds supported files under a folder in a single os.scandir pass.
+
+    Each entry records the file's path, size, mtime and inode, taken from the
+    directory scan so later stages (the cache lookup, scheduling) need no
+    stat calls of their own. include globs keep only matching files, exclude
+    globs drop files and prune whole directories; a glob matches either the
+    path relative to the root or the bare name. Files larger than max_bytes
+    are skipped, as are extensions without a registered parser. Entries can
+    be saved as a manifest and read back instead of scanning the tree again."""
+
+    def __init__(self, logger, include=(), exclude=(), max_bytes=None):
+        self.logger = logger
+        self.include = _glob_regex(include)
+        self.exclude = _glob_regex(exclude)
+        self.max_bytes = max_bytes
+        self.extensions = registry.supported_extensions()
+        self.skipped = {"excluded": 0, "too large": 0, "unreadable": 0}
+
+    def _matches(self, regex, rel, name):
+        return bool(regex.match(rel) or regex.match(name))
+
+    def _accept(self, rel, name, size):
+        if not name.lower().endswith(self.extensions):
+            return False
+        if self.include and not self._matches(self.include, rel, name):
+            self.skipped["excluded"] += 1
+            return False
+        if self.exclude and self._matches(self.exclude, rel, name):
+            self.skipped["excluded"] += 1
+            return False
+        if self.max_bytes is not None and size > self.max_bytes:
+            self.skipped["too large"] += 1
+            return False
+        return True
+
+    def scan(self, root):
+        """Return the entries of all supported files under root."""
+        self.logger.info(f"Scanning folder: {root}")
+        entries = []
+        stack = [(root, "")]
+        while stack:
+            folder, prefix = stack.pop()
+            try:
+                with os.scandir(folder) as it:
+                    dir_entries = list(it)
+            except OSError as e:
+                self.logger.warn(f"Cannot read folder {folder}: {e}")
+                self.skipped["unreadable"] += 1
+                continue
+            for entry in dir_entries:
+                rel = prefix + entry.name
+                try:
+                    # Like os.walk, symlinked folders are not followed
+                    if entry.is_dir(follow_symlinks=False):
+                        if not (self.exclude and self._matches(self.exclude, rel, entry.name)):
+                            stack.append((entry.path, rel + "/"))
+                        continue
+                    if not entry.name.lower().endswith(self.extensions):
+                        continue
+                    st = entry.stat()
+                except OSError as e:
+                    self.logger.warn(f"Cannot stat {entry.path}: {e}")
+                    self.skipped["unreadable"] += 1
+                    continue
+                if self._accept(rel, entry.name, st.st_size):
+                    entries.append({
+                        "path": entry.path,
+                        "size": st.st_size,
+                        "mtime": st.st_mtime,
+                        "inode": entry.inode(),
+                    })
+        self._log_skipped()
+        return entries
+
+    def _log_skipped(self):
+        skipped = ", ".join(f"{count} {reason}" for reason, count in self.skipped.items() if count)
+        if skipped:
+            self.logger.info(f"Skipped files: {skipped}.")
+
+    # --------------------------------------------------------------
+    # Manifest
+    # --------------------------------------------------------------
+    def write_manifest(self, entries, path):
+        with open(path, "w", newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(MANIFEST_FIELDS)
+            for e in entries:
+                writer.writerow([e["path"], e["size"], repr(e["mtime"]), e["inode"]])
+        self.logger.info(f"Wrote manifest of {len(entries)} files to {path}")
+
+    def read_manifest(self, path, root=None):
+        """Entries of a previously written manifest, filtered by the current rules.
+
+        Relative globs are matched against paths relative to root, when given."""
+        self.logger.info(f"Reading manifest: {path}")
+        entries = []
+        with open(path, newline='') as f:
+            for row in csv.DictReader(f):
+                filepath = row["path"]
+                rel = os.path.relpath(filepath, root) if root else filepath
+                if self._accept(rel.replace(os.sep, "/"), os.path.basename(filepath), int(row["size"])):
+                    entries.append({
+                        "path": filepath,
+                        "size": int(row["size"]),
+                        "mtime": float(row["mtime"]),
+                        "inode": int(row["inode"]),
+                    })
+        self._log_skipped()
+        return entries
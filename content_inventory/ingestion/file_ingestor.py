@@ -1,75 +1,557 @@
+import hashlib
 import os
+import signal
+import threading
+import collections
 import concurrent.futures
 import multiprocessing
+from concurrent.futures.process import BrokenProcessPool
+from collections import Counter
 from tqdm import tqdm
 from content_inventory.utils.logger import Logger
-from content_inventory.ingestion.parsers.text_parser import TextParser
+from content_inventory.ingestion.discovery import FileDiscovery
+from content_inventory.ingestion.parsers import registry
 from content_inventory.ingestion.parsers.pdf_parser import PDFParser
 from content_inventory.ingestion.parsers.docx_parser import DocxParser
+from content_inventory.analysis.entity_extractor import EntityExtractor
+from content_inventory.analysis.duplicate_detector import DuplicateDetector
+from content_inventory.analysis.segment_reuse import SegmentReuseDetector
+from content_inventory.database.file_cache import hash_file
+from content_inventory.analysis.summary_luhn import LuhnSummarizer
+from content_inventory.analysis.document_analyzer import DocumentAnalyzer
+from content_inventory.analysis.nlp_resources import get_resources
+
+EXECUTORS = ("thread", "process")
+
+# Field order of the compact tuples sent back from worker processes
+RECORD_FIELDS = (
+    "filename", "path", "summary", "word_count", "sentiment",
+    "text", "annotation", "entities", "error", "signature", "segments", "content_hash", "text_digest",
+)
+SENTIMENT_FIELDS = ("neg", "neu", "pos", "compound")
+# Fields left out of a document when its worker did not produce them
+OPTIONAL_FIELDS = RECORD_FIELDS[5:]
+
+
+def _to_record(parsed):
+    """Pack a parsed document into a small tuple for cheap pickling."""
+    sentiment = parsed.get("sentiment") or {}
+    return (
+        parsed["filename"],
+        parsed["path"],
+        parsed["summary"],
+        parsed["word_count"],
+        tuple(sentiment.get(k, 0.0) for k in SENTIMENT_FIELDS),
+    ) + tuple(parsed.get(field) for field in OPTIONAL_FIELDS)
+
+
+def _from_record(record):
+    """Rebuild the document dictionary used by the rest of the pipeline."""
+    doc = dict(zip(RECORD_FIELDS, record))
+    doc["sentiment"] = dict(zip(SENTIMENT_FIELDS, doc["sentiment"]))
+    for field in OPTIONAL_FIELDS:
+        if doc[field] is None:
+            del doc[field]
+    return doc
+
+
+# Per-process ingestor and per-file time budget, set once by the pool initializer
+_worker_ingestor = None
+_worker_timeout = None
+
+
+class FileTimeout(BaseException):
+    """Raised inside a worker when a file exceeds its time budget.
+
+    Derives from BaseException so the parsers' own error handling, which
+    records failed files as empty documents, does not swallow it."""
+
+
+def _on_alarm(signum, frame):
+    raise FileTimeout()
+
+
+def _worker_settings():
+    """Class-level settings made in the parent process (e.g. from main's flags)."""
+    return {
+        "boilerplate_patterns": LuhnSummarizer.extra_patterns,
+        "analyzer": DocumentAnalyzer.settings(),
+        "pdf": PDFParser.settings(),
+        "docx": DocxParser.settings(),
+    }
+
+
+def _address_space_bytes():
+    """Current virtual memory size of this process, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _apply_limits(limits, logger):
+    """Install this worker's per-file time budget, memory limit and priority.
+
+    The memory limit caps the address space (RLIMIT_AS), which already holds
+    the loaded models, so it is set to the worker's current size plus the
+    per-file budget."""
+    global _worker_timeout
+    if limits.get("memory_mb"):
+        try:
+            import resource
+            baseline = _address_space_bytes()
+            if baseline is None:
+                baseline = 0
+                logger.warn("Cannot measure worker memory; the memory limit covers the whole worker.")
+            size = baseline + int(limits["memory_mb"] * 2 ** 20)
+            resource.setrlimit(resource.RLIMIT_AS, (size, size))
+        except (ImportError, ValueError, OSError) as e:
+            logger.warn(f"Could not limit worker memory: {e}")
+    if limits.get("timeout"):
+        if hasattr(signal, "setitimer"):
+            signal.signal(signal.SIGALRM, _on_alarm)
+            _worker_timeout = limits["timeout"]
+        else:
+            logger.warn("Per-file timeouts are not supported on this platform.")
+    if limits.get("nice") and hasattr(os, "nice"):
+        os.nice(limits["nice"])
+
+
+def _init_worker(verbose, extract_entities, fingerprint, settings, limits=None, resources=registry.ANALYZER_RESOURCES):
+    """Process pool initializer: load the pool's NLP models and build parsers once per worker."""
+    global _worker_ingestor
+    # Spawned workers do not inherit class state, so the parent's settings are passed in
+    if settings["boilerplate_patterns"]:
+        LuhnSummarizer.set_extra_patterns(settings["boilerplate_patterns"])
+    DocumentAnalyzer.configure(**settings["analyzer"])
+    PDFParser.configure(**settings["pdf"])
+    DocxParser.configure(**settings["docx"])
+    _worker_ingestor = FileIngestor(Logger(verbose=verbose), extract_entities=extract_entities,
+                                    fingerprint=fingerprint)
+    # Touch the lazy models so loading happens here rather than on the first file
+    names = list(resources)
+    if extract_entities:
+        names.append("lemmatizer")
+    for name in names:
+        getattr(_worker_ingestor.resources, name)
+    # Limits are applied after the models are loaded, so they only budget the files
+    _apply_limits(limits or {}, _worker_ingestor.logger)
+
+
+def _parse_within_budget(filepath):
+    """Parse one file in this worker; returns (parsed or None, failure reason or None)."""
+    if _worker_timeout:
+        signal.setitimer(signal.ITIMER_REAL, _worker_timeout)
+    try:
+        return _worker_ingestor._parse_file(filepath), None
+    except FileTimeout:
+        return None, f"timed out after {_worker_timeout:g}s"
+    except MemoryError:
+        return None, "exceeded the memory limit"
+    finally:
+        if _worker_timeout:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _parse_chunk_in_worker(filepaths):
+    records, failures = [], []
+    for filepath in filepaths:
+        parsed, reason = _parse_within_budget(filepath)
+        if reason:
+            failures.append((filepath, reason))
+        else:
+            records.append(_to_record(parsed) if parsed else None)
+    # Cumulative cache counters of this worker, keyed by its pid in the parent
+    return records, failures, (os.getpid(), _worker_ingestor.entity_cache_info())
+
+
+class _WorkerPool:
+    """One executor with its own queue of chunks and bounded set of pending tasks."""
+
+    def __init__(self, chunks, max_pending, new_executor):
+        self.queue = collections.deque(chunks)
+        self.max_pending = max_pending
+        self.pending = {}  # future -> chunk
+        # Files in flight when the pool crashed, not yet cleared or blamed
+        self.suspects = collections.deque()
+        self._new_executor = new_executor
+        self.executor = new_executor()
+
+    def busy(self):
+        return bool(self.queue or self.suspects or self.pending)
+
+    def fill(self, task):
+        if self.suspects:
+            # Suspects run alone, so the next crash is pinned on the file that caused it
+            if not self.pending:
+                chunk = [self.suspects.popleft()]
+                self.pending[self.executor.submit(task, chunk)] = chunk
+            return
+        while self.queue and len(self.pending) < self.max_pending:
+            chunk = self.queue.popleft()
+            self.pending[self.executor.submit(task, chunk)] = chunk
+
+    def restart(self):
+        self.executor.shutdown(wait=True)
+        self.executor = self._new_executor()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
 
 class FileIngestor:
-    """Scans folders for supported files and parses them concurrently."""
+    """Scans folders for supported files and parses them concurrently.
+
+    With extract_entities, each worker also extracts the document's noun phrases
+    from its annotation, so extraction runs in parallel and only the compact
+    per-document counts (not the annotation) are sent back. With fingerprint
+    ("document", or "segments" to add passage fingerprints), each worker also
+    computes the document's MinHash signature and content hashes and sends
+    those back instead of its text.
 
-    def __init__(self, logger: Logger):
+    Each cost class of the parser registry gets its own pool, sized by
+    pool_workers (cost class -> workers), so cheap files are not queued behind
+    expensive ones. Unless given, a class that has the corpus to itself gets
+    all workers and two classes split the workers left by explicit sizes;
+    when fewer workers than pools are left (e.g. workers=1), the pools run
+    one after the other, so no more than workers processes parse at once.
+
+    Results are yielded as they complete, so one slow file does not hold back
+    the files behind it. file_timeout (seconds) and file_memory_mb budget each
+    file inside isolated worker processes; the memory budget is on top of the
+    worker's size once its models are loaded. When a worker crashes, the files
+    in flight on its pool are run again one at a time, so only the file that
+    crashed it is blamed. Files that exceed a budget or crash their worker
+    are set aside and, with retry_failed, parsed again at the end
+    one at a time, at low priority and with RETRY_TIMEOUT_FACTOR times the
+    timeout. Files that still fail are listed in quarantined with the reasons."""
+
+    RETRY_TIMEOUT_FACTOR = 4
+    RETRY_NICE = 10
+
+    def __init__(self, logger: Logger, resources=None, executor="thread", workers=None,
+                 extract_entities=False, file_timeout=None, file_memory_mb=None, retry_failed=True,
+                 pool_workers=None, fingerprint=None):
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor '{executor}', expected one of {EXECUTORS}")
         self.logger = logger
+        self.resources = resources or get_resources()
+        if (file_timeout or file_memory_mb) and executor == "thread":
+            # Budgets can only be enforced in a process that may be interrupted or die
+            logger.warn("Per-file time and memory limits need isolated workers; using the process executor.")
+            executor = "process"
+        self.executor = executor
+        self.extract_entities = extract_entities
+        if fingerprint not in (None, "document", "segments"):
+            raise ValueError(f"Unknown fingerprint mode '{fingerprint}', expected 'document' or 'segments'")
+        self.fingerprint = fingerprint
+        self.file_timeout = file_timeout
+        self.file_memory_mb = file_memory_mb
+        self.retry_failed = retry_failed
+        # Files that failed a budget or crashed a worker: path -> reason
+        self._failed = {}
+        self.quarantined = []
+        # worker key -> latest EntityExtractor.cache_info() of that worker
+        self.entity_cache_stats = {}
+        # Parsers are built once per worker thread and reused for every file
+        self._local = threading.local()
         # Detect number of CPU cores (Apple Silicon friendly)
         self.cpu_count = multiprocessing.cpu_count()
-        self.logger.info(f"Detected {self.cpu_count} CPU cores available.")
+        if workers:
+            self.workers = workers
+        elif executor == "process":
+            self.workers = self.cpu_count
+        else:
+            self.workers = min(self.cpu_count, 8)  # reasonable cap for GIL-bound threads
+        self.pool_workers = {cost: n for cost, n in (pool_workers or {}).items() if n}
+        for cost in self.pool_workers:
+            if cost not in registry.COST_CLASSES:
+                raise ValueError(f"Unknown cost class '{cost}', expected one of {registry.COST_CLASSES}")
+
+    def _get_parser(self, parser_cls):
+        """Return this worker's instance of parser_cls, creating it on first use."""
+        parsers = getattr(self._local, "parsers", None)
+        if parsers is None:
+            parsers = self._local.parsers = {}
+        parser = parsers.get(parser_cls)
+        if parser is None:
+            parser = parsers[parser_cls] = parser_cls(self.logger, resources=self.resources)
+        return parser
+
+    def _fingerprinters(self):
+        """This worker's (DuplicateDetector, SegmentReuseDetector or None), only used to fingerprint."""
+        fingerprinters = getattr(self._local, "fingerprinters", None)
+        if fingerprinters is None:
+            fingerprinters = self._local.fingerprinters = (
+                DuplicateDetector(self.logger),
+                SegmentReuseDetector(self.logger) if self.fingerprint == "segments" else None,
+            )
+        return fingerprinters
+
+    def _add_fingerprints(self, parsed):
+        """Replace the parsed document's text with its signature, passage
+        fingerprints and hashes, which are all the later stages need of it."""
+        text = parsed.pop("text", "")
+        dupe_detector, segment_detector = self._fingerprinters()
+        parsed["signature"] = dupe_detector.fingerprint(text)
+        if segment_detector is not None:
+            parsed["segments"] = segment_detector.fingerprint(text)
+        parsed["text_digest"] = hashlib.sha256(text.encode("utf8")).hexdigest()
+        try:
+            parsed["content_hash"] = hash_file(parsed["path"])
+        except OSError as e:
+            self.logger.warn(f"Could not hash {parsed['path']}: {e}")
 
     def _parse_file(self, filepath):
         """Internal helper to parse a single file safely."""
-        parser = None
         file = os.path.basename(filepath)
 
         try:
-            # Choose parser by file extension
-            if file.lower().endswith(('.txt', '.md', '.html', '.xml')):
-                parser = TextParser(self.logger)
-            elif file.lower().endswith('.pdf'):
-                parser = PDFParser(self.logger)
-            elif file.lower().endswith('.docx'):
-                parser = DocxParser(self.logger)
-            else:
+            spec = registry.spec_for(filepath)
+            if spec is None:
                 return None  # unsupported
+            parser = self._get_parser(spec.parser_cls)
 
-            parsed = parser.parse(filepath)
+            extractor = self._get_parser(EntityExtractor) if self.extract_entities else None
+            parsed = parser.parse(filepath, extractor=extractor)
+            if extractor is not None:
+                # Parsers fill in entities from the annotation; failed parses have none
+                parsed.setdefault("entities", Counter())
+                self.entity_cache_stats[threading.get_ident()] = extractor.cache_info()
+            if self.fingerprint:
+                self._add_fingerprints(parsed)
             self.logger.info(f"Parsed: {file} ({parsed['word_count']} words)")
             return parsed
 
+        except MemoryError:
+            raise
         except Exception as e:
             self.logger.error(f"Failed to parse {file}: {e}")
             return None
 
-    def ingest_folder(self, path):
-        """Ingest all supported files in a directory using multithreading."""
-        corpus = []
-        self.logger.info(f"Scanning folder: {path}")
+    def _parse_chunk(self, filepaths):
+        return [self._parse_file(fp) for fp in filepaths], [], None
+
+    def _new_executor(self, workers, limits, resources):
+        if self.executor == "process":
+            return concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self.logger.verbose, self.extract_entities, self.fingerprint, _worker_settings(),
+                          limits, resources),
+            )
+        return concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+
+    def _pool_sizes(self, costs):
+        """Workers for each cost class present in the corpus, and whether the
+        pools run side by side (False: one after the other)."""
+        explicit = {cost: self.pool_workers[cost] for cost in costs if cost in self.pool_workers}
+        rest = [cost for cost in costs if cost not in explicit]
+        budget = self.workers - sum(explicit.values())
+        if budget < len(rest):
+            # Too few workers for a pool per class: each class gets them in turn
+            return {cost: explicit.get(cost, self.workers) for cost in costs}, False
+        sizes = dict(explicit)
+        for i, cost in enumerate(rest):
+            sizes[cost] = budget // len(rest) + (i < budget % len(rest))
+        return {cost: sizes[cost] for cost in costs}, True
+
+    def _chunks(self, filepaths, workers, sizes=None):
+        """Split filepaths into tasks, largest files first when their sizes are known.
+
+        Scheduling the longest jobs first (LPT) keeps a big file from starting
+        last and running alone at the end. Chunks are capped both in files and
+        in bytes, so the large files at the front go out one per task while
+        small files are still batched."""
+        if self.executor == "process":
+            # Several files per task amortize IPC; small chunks keep the tail balanced
+            chunksize = max(1, min(32, len(filepaths) // (workers * 4)))
+        else:
+            chunksize = 1
+        if not sizes:
+            return [filepaths[start:start + chunksize] for start in range(0, len(filepaths), chunksize)]
+
+        filepaths = sorted(filepaths, key=lambda p: sizes.get(p, 0), reverse=True)
+        max_bytes = sum(sizes.get(p, 0) for p in filepaths) / (workers * 4)
+        chunks, chunk, chunk_bytes = [], [], 0
+        for path in filepaths:
+            chunk.append(path)
+            chunk_bytes += sizes.get(path, 0)
+            if len(chunk) >= chunksize or chunk_bytes >= max_bytes:
+                chunks.append(chunk)
+                chunk, chunk_bytes = [], 0
+        if chunk:
+            chunks.append(chunk)
+        return chunks
 
-        # Gather all supported files
-        filepaths = []
-        for root, _, files in os.walk(path):
-            for file in files:
-                if file.lower().endswith(('.txt', '.md', '.html', '.xml', '.pdf', '.docx')):
-                    filepaths.append(os.path.join(root, file))
+    def _iter_parsed(self, filepaths, sizes=None):
+        """Yield parsed documents as they complete, then retry the files that failed."""
+        by_cost = {}
+        for path in filepaths:
+            by_cost.setdefault(registry.spec_for(path).cost, []).append(path)
+        pool_sizes, side_by_side = self._pool_sizes([cost for cost in registry.COST_CLASSES if cost in by_cost])
+        self.logger.info(
+            f"Processing files with {self.executor} worker pools: "
+            + ", ".join(f"{cost} {n} ({len(by_cost[cost])} files)" for cost, n in pool_sizes.items())
+            + ("" if side_by_side else ", one after the other")
+            + f" ({self.cpu_count} CPU cores available)..."
+        )
+
+        limits = {"timeout": self.file_timeout, "memory_mb": self.file_memory_mb}
+        lanes = [
+            (self._chunks(by_cost[cost], n, sizes), n, n * 2, self._resources(by_cost[cost]))
+            for cost, n in pool_sizes.items()
+        ]
+        if side_by_side:
+            yield from self._run_chunks(lanes, limits)
+        else:
+            for lane in lanes:
+                yield from self._run_chunks([lane], limits)
+
+        failed, self._failed = self._failed, {}
+        if failed and self.retry_failed:
+            self.logger.info(f"Retrying {len(failed)} failed files one at a time at low priority...")
+            limits = {
+                "timeout": self.file_timeout and self.file_timeout * self.RETRY_TIMEOUT_FACTOR,
+                "memory_mb": self.file_memory_mb,
+                "nice": self.RETRY_NICE,
+            }
+            # One file in flight at a time, so a crash is attributed to the right file
+            lanes = [([[path] for path in failed], 1, 1, self._resources(failed))]
+            yield from self._run_chunks(lanes, limits)
+            failed = {path: f"{reason}; retry {self._failed[path]}"
+                      for path, reason in failed.items() if path in self._failed}
+            self._failed = {}
+
+        for path, reason in failed.items():
+            self.logger.warn(f"Quarantined {path}: {reason}")
+            self.quarantined.append({"path": path, "reason": reason})
+            yield None
+
+    def _resources(self, filepaths):
+        """NLP resources needed by the parsers of filepaths."""
+        names = {}
+        for path in filepaths:
+            names.update(dict.fromkeys(registry.spec_for(path).resources))
+        return tuple(names)
+
+    def _run_chunks(self, lanes, limits):
+        """Run each lane (chunks, workers, max pending, resources) on its own fresh
+        pool and yield results from all of them in completion order. A crashed
+        process pool is replaced; if a single file was in flight it is recorded
+        as failed, otherwise the files in flight are run again one at a time."""
+        task = _parse_chunk_in_worker if self.executor == "process" else self._parse_chunk
+        pools = []
+        try:
+            for chunks, workers, max_pending, resources in lanes:
+                pools.append(_WorkerPool(
+                    chunks, max_pending, lambda w=workers, r=resources: self._new_executor(w, limits, r)
+                ))
+            while any(pool.busy() for pool in pools):
+                for pool in pools:
+                    pool.fill(task)
+                waiting = [future for pool in pools for future in pool.pending]
+                done, _ = concurrent.futures.wait(waiting, return_when=concurrent.futures.FIRST_COMPLETED)
+                for pool in pools:
+                    crashed = []
+                    for future in [f for f in pool.pending if f in done]:
+                        crashed += yield from self._chunk_results(future, pool.pending.pop(future))
+                    if crashed:
+                        # Every other task on the dead pool fails too; collect them and start over
+                        for future in list(pool.pending):
+                            crashed += yield from self._chunk_results(future, pool.pending.pop(future))
+                        pool.restart()
+                        if len(crashed) == 1:
+                            self._failed[crashed[0]] = "worker process crashed"
+                        else:
+                            pool.suspects.extend(crashed)
+        finally:
+            for pool in pools:
+                pool.shutdown()
+
+    def _chunk_results(self, future, chunk):
+        """Yield the parsed documents of one finished chunk; returns its files
+        if its pool died while they were in flight."""
+        try:
+            results, failures, stats = future.result()
+        except BrokenProcessPool:
+            return list(chunk)
+        except (Exception, FileTimeout) as e:
+            for path in chunk:
+                self._failed[path] = f"failed: {e!r}"
+            return []
+        if stats:
+            pid, info = stats
+            if info:
+                self.entity_cache_stats[pid] = info
+        for path, reason in failures:
+            self._failed[path] = reason
+        for result in results:
+            if self.executor == "process" and result:
+                result = _from_record(result)
+            yield result
+        return []
+
+    def entity_cache_info(self):
+        """Lemma and phrase cache counters summed over all workers."""
+        total = {}
+        for info in list(self.entity_cache_stats.values()):
+            for key, value in info.items():
+                total[key] = total.get(key, 0) + value
+        return total
+
+    def _log_entity_cache(self):
+        info = self.entity_cache_info()
+        if not info:
+            return
+        for cache in ("lemma", "phrase"):
+            hits, misses = info[f"{cache}_hits"], info[f"{cache}_misses"]
+            rate = hits / (hits + misses) if hits + misses else 0.0
+            self.logger.info(
+                f"Entity {cache} cache: {hits} hits, {misses} misses ({rate:.1%} hit rate), "
+                f"{info[f'{cache}_size']} entries."
+            )
+
+    def iter_folder(self, path, cache=None, entries=None, fresh=True):
+        """Yield documents one at a time as they are parsed (streaming mode).
+
+        entries are FileDiscovery results (the folder is scanned when omitted);
+        fresh means they were just scanned, so their sizes and mtimes can stand
+        in for the cache's own stat calls. When a FileCache is given, unchanged
+        files are restored from it and only new or modified files are parsed."""
+        if entries is None:
+            entries = FileDiscovery(self.logger).scan(path)
+        filepaths = [e["path"] for e in entries]
+        sizes = {e["path"]: e["size"] for e in entries}
 
         if not filepaths:
             self.logger.warn("No supported files found.")
-            return corpus
+            return
 
         self.logger.info(f"Discovered {len(filepaths)} supported files.")
-        max_workers = min(self.cpu_count, 8)  # reasonable cap
-        self.logger.info(f"Processing files with {max_workers} concurrent threads...")
-
-        # Multithreaded parsing with progress bar
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            for result in tqdm(
-                executor.map(self._parse_file, filepaths),
-                total=len(filepaths),
-                desc="Parsing files",
-                unit="file"
-            ):
-                if result:
-                    corpus.append(result)
-
-        self.logger.success(f"Ingested {len(corpus)} files total.")
-        return corpus
\ No newline at end of file
+        ingested = 0
+
+        if cache is not None:
+            stats = {e["path"]: (e["size"], e["mtime"]) for e in entries} if fresh else None
+            cached, filepaths = cache.partition(filepaths, stats)
+            for doc in cached:
+                ingested += 1
+                yield doc
+            if not filepaths:
+                self.logger.success(f"Ingested {ingested} files total (all from cache).")
+                return
+
+        # Parallel parsing with progress bar
+        results = self._iter_parsed(filepaths, sizes)
+        for result in tqdm(results, total=len(filepaths), desc="Parsing files", unit="file"):
+            if result:
+                ingested += 1
+                yield result
+
+        self.logger.success(f"Ingested {ingested} files total.")
+        self._log_entity_cache()
+
+    def ingest_folder(self, path, cache=None, entries=None, fresh=True):
+        """Ingest all supported files in a directory and return them as a list."""
+        return list(self.iter_folder(path, cache=cache, entries=entries, fresh=fresh))
@@ -0,0 +1,38 @@
+from content_inventory.analysis.document_analyzer import DocumentAnalyzer
+from content_inventory.analysis.nlp_resources import get_resources
+
+
+def empty_document(filepath):
+    """Inventory record of a file without any text."""
+    return {
+        "filename": filepath.split("/")[-1],
+        "path": filepath,
+        "text": "",
+        "summary": "",
+        "word_count": 0,
+        "sentiment": {"compound": 0.0}
+    }
+
+
+class BaseParser:
+    """Shared setup and failure handling of the format parsers. Subclasses set
+    FORMAT and implement parse(filepath, extractor=None)."""
+
+    FORMAT = "file"
+
+    def __init__(self, logger, resources=None):
+        self.logger = logger
+        self.resources = resources or get_resources()
+        self.analyzer = DocumentAnalyzer(logger, resources=self.resources)
+
+    def failed(self, filepath, error):
+        """Record a file that could not be parsed as an empty document marked
+        with the error, which keeps it out of the incremental cache.
+
+        MemoryError is re-raised so the ingestor quarantines the file instead."""
+        if isinstance(error, MemoryError):
+            raise error
+        self.logger.error(f"Failed to parse {self.FORMAT} file {filepath}: {error}")
+        doc = empty_document(filepath)
+        doc["error"] = str(error)
+        return doc
@@ -1,41 +1,177 @@
-from docx import Document
-from content_inventory.analysis.summary_luhn import LuhnSummarizer
-from nltk.sentiment import SentimentIntensityAnalyzer
+import posixpath
+import re
+import zipfile
+from lxml import etree
+from content_inventory.ingestion.parsers.base import BaseParser
+from content_inventory.utils.settings import ClassSettings
 
-class DocxParser:
-    """Parses .docx files and generates structured document data."""
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+OFFICE_DOCUMENT = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+PACKAGE_RELS = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
 
-    def __init__(self, logger):
-        self.logger = logger
-        self.summarizer = LuhnSummarizer(logger)
-        self.sentiment_analyzer = SentimentIntensityAnalyzer()
+# Run content translated the same way as python-docx's Paragraph.text
+_RUN_TEXT = {W + "tab": "\t", W + "ptab": "\t", W + "cr": "\n", W + "noBreakHyphen": "-"}
+_PART_NUMBER = re.compile(r"(\d+)\.xml$")
 
-    def parse(self, filepath):
+
+def _run_text(run):
+    parts = []
+    for child in run:
+        if child.tag == W + "t":
+            parts.append(child.text or "")
+        elif child.tag == W + "br":
+            if child.get(W + "type", "textWrapping") == "textWrapping":
+                parts.append("\n")
+        else:
+            parts.append(_RUN_TEXT.get(child.tag, ""))
+    return "".join(parts)
+
+
+def _paragraph_text(p):
+    """Text of the runs (including hyperlinked runs) directly inside a w:p."""
+    parts = []
+    for child in p:
+        if child.tag == W + "r":
+            parts.append(_run_text(child))
+        elif child.tag == W + "hyperlink":
+            parts.extend(_run_text(run) for run in child.iterchildren(W + "r"))
+    return "".join(parts)
+
+
+def _in_fallback(elem):
+    """True for the duplicate copy of a text box kept for older Word versions."""
+    return next(elem.iterancestors(MC_FALLBACK), None) is not None
+
+
+def iter_part_paragraphs(source, tables=True):
+    """Yield the non-empty paragraphs of one WordprocessingML part, streaming.
+
+    Elements are cleared as soon as they are read, so memory stays flat however
+    large the part is. With tables, each table row becomes one line with its
+    cells separated by tabs; without, paragraphs inside tables are skipped."""
+    rows = []  # stack of rows being read, for nested tables: list of cells, each a list of lines
+    table_depth = 0
+    for event, elem in etree.iterparse(source, events=("start", "end"),
+                                       tag=(W + "p", W + "tbl", W + "tr", W + "tc")):
+        tag = elem.tag
+        if event == "start":
+            if tag == W + "tbl":
+                table_depth += 1
+            elif tables and tag == W + "tr":
+                rows.append([])
+            elif tables and tag == W + "tc" and rows:
+                rows[-1].append([])
+            continue
+
+        if tag == W + "p":
+            if not table_depth or tables:
+                text = _paragraph_text(elem)
+                if text.strip() and not _in_fallback(elem):
+                    if table_depth and rows and rows[-1]:
+                        rows[-1][-1].append(text)
+                    elif not table_depth:
+                        yield text
+        elif tag == W + "tr" and tables:
+            row = rows.pop()
+            line = "\t".join(" ".join(cell) for cell in row if cell)
+            if line.strip():
+                if rows and rows[-1]:
+                    rows[-1][-1].append(line)
+                else:
+                    yield line
+        elif tag == W + "tbl":
+            table_depth -= 1
+        elif tag == W + "tc":
+            continue  # cleared with its row
+
+        if tag != W + "p" or not rows:
+            # Free what has been read; a paragraph in an open table row is freed with the row
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+
+def _main_part(zf):
+    """Name of the main document part, normally word/document.xml."""
+    try:
+        rels = etree.fromstring(zf.read("_rels/.rels"))
+        for rel in rels.iter(PACKAGE_RELS):
+            if rel.get("Type") == OFFICE_DOCUMENT:
+                return rel.get("Target").lstrip("/")
+    except KeyError:
+        pass
+    return "word/document.xml"
+
+
+def _numbered_parts(names, folder, prefix):
+    parts = [n for n in names if n.startswith(f"{folder}/{prefix}") and n.endswith(".xml")]
+    return sorted(parts, key=lambda n: int(m.group(1)) if (m := _PART_NUMBER.search(n)) else 0)
+
+
+def iter_docx_paragraphs(filepath, tables=True, headers=True, footnotes=True):
+    """Yield the paragraphs of a .docx file straight from its zip parts.
+
+    Order: headers, body, footnotes and endnotes, footers. Header and footer
+    lines repeated across sections are only yielded once."""
+    with zipfile.ZipFile(filepath) as zf:
+        main = _main_part(zf)
+        folder = posixpath.dirname(main)
+        names = zf.namelist()
+
+        def stream(names, unique=False):
+            seen = set()
+            for name in names:
+                with zf.open(name) as part:
+                    for text in iter_part_paragraphs(part, tables):
+                        if unique:
+                            if text in seen:
+                                continue
+                            seen.add(text)
+                        yield text
+
+        if headers:
+            yield from stream(_numbered_parts(names, folder, "header"), unique=True)
+        yield from stream([main])
+        if footnotes:
+            yield from stream([f"{folder}/{n}" for n in ("footnotes.xml", "endnotes.xml")
+                               if f"{folder}/{n}" in names])
+        if headers:
+            yield from stream(_numbered_parts(names, folder, "footer"), unique=True)
+
+
+class DocxParser(BaseParser, ClassSettings):
+    """Parses .docx files and generates structured document data.
+
+    Text is read from the XML parts with lxml iterparse rather than loaded
+    through python-docx's object model, which avoids building the object tree
+    (the paragraphs are still joined into the document's full text). Tables, headers/footers and
+    footnotes/endnotes are included by default; the class attributes are
+    changed with configure() and handed to process workers like the analyzer
+    settings."""
+
+    FORMAT = "DOCX"
+    SETTINGS = ("tables", "headers", "footnotes")
+    tables = True
+    headers = True
+    footnotes = True
+
+    def parse(self, filepath, extractor=None):
         """Read and summarize a DOCX file."""
         self.logger.info(f"Parsing DOCX: {filepath}")
         try:
-            doc = Document(filepath)
-            text = "\n".join(p.text for p in doc.paragraphs if p.text.strip())
-
-            summary = self.summarizer.summarize(text)
-            sentiment = self.sentiment_analyzer.polarity_scores(text)
+            paragraphs = iter_docx_paragraphs(filepath, self.tables, self.headers, self.footnotes)
+            text, analysis = self.analyzer.analyze_stream(paragraphs, extractor, separator="\n")
+            if analysis is None:
+                analysis = self.analyzer.analyze(text, extractor)
 
             return {
                 "filename": filepath.split("/")[-1],
                 "path": filepath,
                 "text": text,
-                "summary": summary,
                 "word_count": len(text.split()),
-                "sentiment": sentiment
+                **analysis
             }
 
         except Exception as e:
-            self.logger.error(f"Failed to parse DOCX file {filepath}: {e}")
-            return {
-                "filename": filepath.split("/")[-1],
-                "path": filepath,
-                "text": "",
-                "summary": "",
-                "word_count": 0,
-                "sentiment": {"compound": 0.0}
-            }
\ No newline at end of file
+            return self.failed(filepath, e)
@@ -0,0 +1,113 @@
+from lxml import etree
+from content_inventory.ingestion.parsers.base import BaseParser
+
+# Elements whose content is never visible text
+HIDDEN_TAGS = ("script", "style", "noscript", "template", "svg", "head")
+
+# HTML elements that start a new line of text
+BLOCK_TAGS = frozenset((
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "figcaption",
+    "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li",
+    "main", "nav", "ol", "p", "pre", "section", "table", "tr", "ul",
+))
+CELL_TAGS = frozenset(("td", "th"))
+
+
+def _clean_lines(text):
+    """Collapse runs of whitespace within lines and drop blank lines."""
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def html_text(filepath):
+    """Visible text of an HTML file, one line per block element."""
+    parser = etree.HTMLParser(remove_comments=True, remove_pis=True)
+    root = etree.parse(filepath, parser).getroot()
+    if root is None:
+        return ""
+    title = root.findtext(".//title") or ""
+    etree.strip_elements(root, *HIDDEN_TAGS, with_tail=False)
+    for el in root.iter():
+        if el.tag in BLOCK_TAGS:
+            el.tail = "\n" + (el.tail or "")
+        elif el.tag in CELL_TAGS:
+            el.tail = "\t" + (el.tail or "")
+    return _clean_lines(title + "\n" + "".join(root.itertext()))
+
+
+def _is_mixed(el):
+    """True if text runs directly inside el, so its children are inline markup."""
+    if el.text and el.text.strip():
+        return True
+    return any(child.tail and child.tail.strip() for child in el)
+
+
+def xml_text(filepath):
+    """Text content of an XML file, one line per paragraph-like element.
+
+    Without a schema, an element that holds text directly (mixed content, as in
+    DocBook or DITA paragraphs) is taken as one paragraph including its inline
+    children; other elements are descended into."""
+    # No entity expansion or network access for untrusted files; tolerate malformed markup
+    parser = etree.XMLParser(remove_comments=True, remove_pis=True, resolve_entities=False,
+                             no_network=True, recover=True, huge_tree=True)
+    root = etree.parse(filepath, parser).getroot()
+    if root is None:
+        return ""
+    lines = []
+    stack = [root]
+    while stack:
+        el = stack.pop()
+        if not isinstance(el.tag, str):
+            continue  # entity references and other non-element nodes
+        if _is_mixed(el) or len(el) == 0:
+            lines.append("".join(el.itertext(etree.Element)))
+        else:
+            stack.extend(reversed(el))
+    return _clean_lines("\n".join(lines))
+
+
+class MarkupParser(BaseParser):
+    """Base for parsers that strip markup before analysis, so only the text
+    reaches the NLP stages. Subclasses set FORMAT and extract_text."""
+
+    FORMAT = "markup"
+
+    def extract_text(self, filepath):
+        raise NotImplementedError
+
+    def parse(self, filepath, extractor=None):
+        """Read, strip and summarize a markup file."""
+        self.logger.info(f"Parsing {self.FORMAT}: {filepath}")
+        try:
+            text = self.extract_text(filepath)
+            analysis = self.analyzer.analyze(text, extractor)
+
+            return {
+                "filename": filepath.split("/")[-1],
+                "path": filepath,
+                "text": text,
+                "word_count": len(text.split()),
+                **analysis
+            }
+
+        except Exception as e:
+            return self.failed(filepath, e)
+
+
+class HTMLParser(MarkupParser):
+    """Parses HTML files, dropping scripts, styles and tags."""
+
+    FORMAT = "HTML"
+
+    def extract_text(self, filepath):
+        return html_text(filepath)
+
+
+class XMLParser(MarkupParser):
+    """Parses XML files, keeping only element text."""
+
+    FORMAT = "XML"
+
+    def extract_text(self, filepath):
+        return xml_text(filepath)
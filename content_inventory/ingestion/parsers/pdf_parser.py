@@ -1,50 +1,155 @@
-from pdfminer.high_level import extract_text
-from content_inventory.analysis.summary_luhn import LuhnSummarizer
-from nltk.sentiment import SentimentIntensityAnalyzer
+import concurrent.futures
+import io
+import time
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from content_inventory.ingestion.parsers.base import BaseParser, empty_document
+from content_inventory.utils.settings import ClassSettings
 
-class PDFParser:
-    """Parses PDF files, summarizes them using Luhn's algorithm, and extracts sentiment."""
 
-    def __init__(self, logger):
-        self.logger = logger
-        self.summarizer = LuhnSummarizer(logger)
-        self.sentiment_analyzer = SentimentIntensityAnalyzer()
+def iter_pages(filepath, laparams=None, page_numbers=None):
+    """Yield (page number, text, seconds) for each page of a PDF, one page at a time.
 
-    def parse(self, filepath):
+    laparams=None skips layout analysis entirely (fast "text only" mode);
+    an LAParams instance gives the same text as pdfminer's extract_text."""
+    with open(filepath, "rb") as fp:
+        manager = PDFResourceManager(caching=True)
+        output = io.StringIO()
+        device = TextConverter(manager, output, laparams=laparams)
+        interpreter = PDFPageInterpreter(manager, device)
+        try:
+            pages = PDFPage.get_pages(fp, pagenos=page_numbers)
+            for number, page in enumerate(pages):
+                start = time.perf_counter()
+                interpreter.process_page(page)
+                text = output.getvalue()
+                output.seek(0)
+                output.truncate(0)
+                page_number = page_numbers[number] if page_numbers is not None else number
+                yield page_number, text, time.perf_counter() - start
+        finally:
+            device.close()
+
+
+def count_pages(filepath):
+    with open(filepath, "rb") as fp:
+        return sum(1 for _ in PDFPage.get_pages(fp))
+
+
+def _extract_page_range(filepath, laparams_kwargs, page_numbers):
+    """Process pool task: extract a contiguous range of pages."""
+    laparams = None if laparams_kwargs is None else LAParams(**laparams_kwargs)
+    return list(iter_pages(filepath, laparams, page_numbers=page_numbers))
+
+
+def _terminate(pool):
+    """Stop a process pool's workers at once instead of waiting for their tasks."""
+    terminate = getattr(pool, "terminate_workers", None)  # Python 3.14+
+    if terminate is not None:
+        terminate()
+        return
+    processes = list((pool._processes or {}).values())
+    for process in processes:
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.join()
+
+
+class PDFParser(BaseParser, ClassSettings):
+    """Parses PDF files, summarizes them using Luhn's algorithm, and extracts sentiment.
+
+    Pages are extracted one at a time and fed to the analyzer, so large PDFs
+    are analyzed in windows as their pages arrive; the document's full text
+    is still assembled for word counts and fingerprints (each parallel page
+    range is likewise returned as one list).
+    Settings are class attributes changed with configure() and handed to
+    process workers like the analyzer settings: text_only skips layout
+    analysis, laparams overrides LAParams fields, page_workers > 1 extracts
+    PDFs of at least parallel_min_pages pages as page ranges in separate
+    processes, and pages slower than slow_page_seconds are reported."""
+
+    FORMAT = "PDF"
+    SETTINGS = ("text_only", "laparams", "page_workers", "parallel_min_pages", "slow_page_seconds")
+    text_only = False
+    laparams = {}
+    page_workers = 0
+    parallel_min_pages = 200
+    slow_page_seconds = 5.0
+
+    @classmethod
+    def configure(cls, **settings):
+        super().configure(**settings)
+        # Fail at startup rather than on the first PDF if a field is unknown
+        LAParams(**cls.laparams)
+
+    def _iter_pages(self, filepath):
+        """(page number, text, seconds) in page order, extracted here or as parallel page ranges."""
+        kwargs = None if self.text_only else dict(self.laparams)
+        if self.page_workers > 1:
+            num_pages = count_pages(filepath)
+            if num_pages >= self.parallel_min_pages:
+                self.logger.info(f"Extracting {num_pages} pages with {self.page_workers} processes: {filepath}")
+                size = -(-num_pages // self.page_workers)
+                ranges = [list(range(s, min(s + size, num_pages))) for s in range(0, num_pages, size)]
+                pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.page_workers)
+                try:
+                    futures = [pool.submit(_extract_page_range, filepath, kwargs, r) for r in ranges]
+                    for future in futures:
+                        yield from future.result()
+                except BaseException:
+                    # A file timeout, an error or an abandoned parse must not wait
+                    # for the remaining page ranges
+                    _terminate(pool)
+                    raise
+                pool.shutdown()
+                return
+        yield from iter_pages(filepath, None if kwargs is None else LAParams(**kwargs))
+
+    def _page_texts(self, filepath, timings):
+        pages = self._iter_pages(filepath)
+        try:
+            for number, text, seconds in pages:
+                timings.append((number, seconds))
+                if seconds >= self.slow_page_seconds:
+                    self.logger.warn(f"Slow PDF page: {filepath} page {number + 1} took {seconds:.1f}s")
+                yield text
+        finally:
+            pages.close()
+
+    def parse(self, filepath, extractor=None):
         """Read and summarize a PDF file."""
         self.logger.info(f"Parsing PDF: {filepath}")
         try:
-            text = extract_text(filepath) or ""
+            timings = []
+            # Pages are fed to the analyzer, which switches to windows for large PDFs
+            pages = self._page_texts(filepath, timings)
+            try:
+                text, analysis = self.analyzer.analyze_stream(pages, extractor)
+            finally:
+                # Stops page-range processes at once if parsing is cut short (e.g. a file timeout)
+                pages.close()
+
+            if timings:
+                slowest = max(timings, key=lambda t: t[1])
+                self.logger.debug(
+                    f"PDF timing: {filepath}: {len(timings)} pages in {sum(t[1] for t in timings):.2f}s, "
+                    f"slowest page {slowest[0] + 1} ({slowest[1]:.2f}s)"
+                )
+
             if not text.strip():
                 self.logger.warn(f"No extractable text in {filepath}")
-                return {
-                    "filename": filepath.split("/")[-1],
-                    "path": filepath,
-                    "text": "",
-                    "summary": "",
-                    "word_count": 0,
-                    "sentiment": {"compound": 0.0}
-                }
-
-            summary = self.summarizer.summarize(text)
-            sentiment = self.sentiment_analyzer.polarity_scores(text)
+                return empty_document(filepath)
 
             return {
                 "filename": filepath.split("/")[-1],
                 "path": filepath,
                 "text": text,
-                "summary": summary,
                 "word_count": len(text.split()),
-                "sentiment": sentiment
+                **analysis
             }
 
         except Exception as e:
-            self.logger.error(f"Failed to parse PDF {filepath}: {e}")
-            return {
-                "filename": filepath.split("/")[-1],
-                "path": filepath,
-                "text": "",
-                "summary": "",
-                "word_count": 0,
-                "sentiment": {"compound": 0.0}
-            }
\ No newline at end of file
+            return self.failed(filepath, e)
@@ -0,0 +1,60 @@
+import os
+from content_inventory.ingestion.parsers.text_parser import TextParser
+from content_inventory.ingestion.parsers.markup_parser import HTMLParser, XMLParser
+from content_inventory.ingestion.parsers.pdf_parser import PDFParser
+from content_inventory.ingestion.parsers.docx_parser import DocxParser
+
+# Cost classes get separate worker pools, so cheap files never queue behind expensive ones
+COST_CLASSES = ("fast", "slow")
+
+# NLP models every parser needs through DocumentAnalyzer
+ANALYZER_RESOURCES = ("stop_words", "tagger", "sentiment_analyzer")
+
+
+class ParserSpec:
+    """A parser class with the extensions it handles, its cost class and the
+    NLP resources its workers should load up front."""
+
+    def __init__(self, parser_cls, extensions, cost="fast", resources=ANALYZER_RESOURCES):
+        if cost not in COST_CLASSES:
+            raise ValueError(f"Unknown cost class '{cost}', expected one of {COST_CLASSES}")
+        self.parser_cls = parser_cls
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.cost = cost
+        self.resources = tuple(resources)
+
+    def __repr__(self):
+        return f"ParserSpec({self.parser_cls.__name__}, {self.extensions}, cost={self.cost!r})"
+
+
+# extension -> ParserSpec
+_registry = {}
+
+
+def register(parser_cls, extensions, cost="fast", resources=ANALYZER_RESOURCES):
+    """Register parser_cls for the given extensions (later registrations win)."""
+    spec = ParserSpec(parser_cls, extensions, cost, resources)
+    for ext in spec.extensions:
+        _registry[ext] = spec
+    return spec
+
+
+def spec_for(path):
+    """The ParserSpec for path's extension, or None if the format is not supported."""
+    return _registry.get(os.path.splitext(path)[1].lower())
+
+
+def supported_extensions():
+    return tuple(_registry)
+
+
+def registered_specs():
+    """Distinct registered specs, in registration order."""
+    return list(dict.fromkeys(_registry.values()))
+
+
+register(TextParser, (".txt", ".md"), cost="fast")
+register(HTMLParser, (".html", ".htm"), cost="fast")
+register(XMLParser, (".xml",), cost="fast")
+register(DocxParser, (".docx",), cost="fast")
+register(PDFParser, (".pdf",), cost="slow")
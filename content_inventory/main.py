@@ -6,47 +6,345 @@ import argparse
 import os
 from content_inventory.utils.logger import Logger
 from content_inventory.ingestion.file_ingestor import FileIngestor
+from content_inventory.ingestion.discovery import FileDiscovery, select_shard
 from content_inventory.analysis.entity_extractor import EntityExtractor
 from content_inventory.analysis.duplicate_detector import DuplicateDetector
+from content_inventory.analysis.duplicate_clusters import cluster_duplicates
+from content_inventory.analysis.segment_reuse import SegmentReuseDetector
+from content_inventory.analysis.heavy_hitters import SpaceSaving
 from content_inventory.reports.markdown_report import MarkdownReport
 from content_inventory.reports.csv_exporter import CSVExporter
+from content_inventory.reports.parquet_exporter import ParquetExporter
 from content_inventory.database.repository import Repository 
+from content_inventory.database.file_cache import FileCache
+from content_inventory.database.shard_store import ShardStore
+from content_inventory.database.background_writer import BackgroundWriter
+from content_inventory.database.lsh_index import PersistentLSH
+from content_inventory.analysis.nlp_resources import get_resources
+from content_inventory.analysis.summary_luhn import LuhnSummarizer, load_patterns
+from content_inventory.analysis.document_analyzer import DocumentAnalyzer
+from content_inventory.ingestion.parsers.pdf_parser import PDFParser
+from content_inventory.ingestion.parsers.docx_parser import DocxParser
+
+def parse_laparams(spec):
+    """Parse 'name=value,...' into LAParams keyword arguments (None, true/false or numbers)."""
+    if not spec:
+        return None
+    params = {}
+    for item in spec.split(","):
+        name, _, value = item.partition("=")
+        value = value.strip()
+        if value.lower() == "none":
+            params[name.strip()] = None
+        elif value.lower() in ("true", "false"):
+            params[name.strip()] = value.lower() == "true"
+        else:
+            params[name.strip()] = float(value)
+    return params
+
+def parse_shard(spec):
+    """Parse 'I/N' into (I, N) with 0 <= I < N."""
+    index, _, count = spec.partition("/")
+    index, count = int(index), int(count)
+    if not 0 <= index < count:
+        raise ValueError(f"shard index must be between 0 and {count - 1}")
+    return index, count
+
+def add_corpus_arguments(parser):
+    """Options of the corpus-level stages, shared by full runs and the shard merge."""
+    parser.add_argument("--db-batch-size", type=int, default=1000,
+                        help="Rows per executemany batch when writing to SQLite")
+    parser.add_argument("--entity-memory-mb", type=float, default=None,
+                        help="Count entities approximately (Space-Saving) within this memory budget")
+    parser.add_argument("--entity-top-k", type=int, default=10000,
+                        help="Entities exported in approximate mode, with their error bounds")
+    parser.add_argument("--no-segments", action="store_true",
+                        help="Skip passage-level reuse detection (winnowing fingerprints)")
+    parser.add_argument("--segment-max-df", type=int, default=50,
+                        help="Ignore passage fingerprints shared by more than this many places (boilerplate)")
+    parser.add_argument("--segment-min-matches", type=int, default=3,
+                        help="Minimum shared fingerprints for a reused passage to be reported")
+    parser.add_argument("--graph-top-k", type=int, default=500,
+                        help="Keep only the K most widespread entities in the semantic map")
+    parser.add_argument("--graph-min-weight", type=int, default=2,
+                        help="Drop co-occurrence edges seen in fewer documents than this")
+    parser.add_argument("--graph-render-limit", type=int, default=300,
+                        help="Max entities drawn in the semantic map PNG (0 skips rendering)")
+    parser.add_argument("--parquet", action="store_true",
+                        help="Also write inventory, entities and duplicates as Parquet (needs pyarrow)")
+    parser.add_argument("--parquet-row-group", type=int, default=100_000,
+                        help="Rows per Parquet row group, the most rows buffered at once")
+
+def build_extractor(args, logger):
+    heavy_hitters = None
+    if args.entity_memory_mb:
+        heavy_hitters = SpaceSaving.from_memory_budget(args.entity_memory_mb, top_k=args.entity_top_k)
+        logger.info(f"Approximate entity counts: monitoring at most {heavy_hitters.capacity} entities.")
+    return EntityExtractor(logger, heavy_hitters=heavy_hitters)
+
+def build_parquet_exporter(args, logger):
+    if not args.parquet:
+        return None
+    try:
+        return ParquetExporter(args.output, logger, row_group_size=args.parquet_row_group)
+    except RuntimeError as e:
+        logger.error(str(e))
+        raise SystemExit(1)
+
+def build_segment_detector(args, logger):
+    if args.no_segments:
+        return None
+    return SegmentReuseDetector(logger, max_doc_freq=args.segment_max_df, min_matches=args.segment_min_matches)
+
+def report_corpus(args, logger, corpus, extractor, dupe_detector, segment_detector,
+                  db_writer, csv_exporter, quarantined, parquet_exporter=None):
+    """Corpus-level analysis, SQLite persistence and reports over the streamed documents."""
+    extractor.finalize()
+    logger.success(f"Extracted {len(extractor.entities)} clean, normalized entities.")
+    if extractor.heavy_hitters is not None:
+        logger.info(f"Approximate entity counts overestimate by at most {extractor.heavy_hitters.error_bound()}.")
+    db_writer.delete_missing([doc["path"] for doc in corpus])
+
+    # 2. Corpus-level analysis
+    duplicates = dupe_detector.find_duplicates()
+    passages = []
+    if segment_detector is not None:
+        passages = segment_detector.find_reused_passages()
+        duplicates += segment_detector.pair_summaries(passages)
+    clusters = cluster_duplicates(duplicates)
+    logger.info(f"Grouped duplicates into {len(clusters)} clusters.")
+
+    # 3. Persist results in SQLite (indexes are built after the bulk load)
+    db_writer.insert_entities(extractor.entities)
+    db_writer.insert_duplicates(duplicates)
+    db_writer.insert_clusters(clusters)
+    db_writer.insert_passages(passages)
+    db_writer.close()
+
+    # 4. Export reports
+    csv_exporter.export_entities(extractor.entities)
+    csv_exporter.export_entity_documents(extractor.index)
+    csv_exporter.export_duplicates(duplicates)
+    csv_exporter.export_clusters(clusters)
+    csv_exporter.export_passages(passages)
+    csv_exporter.export_quarantine(quarantined)
+    if parquet_exporter is not None:
+        parquet_exporter.export_inventory(corpus, clusters)
+        parquet_exporter.export_entities(extractor.entities)
+        parquet_exporter.export_duplicates(duplicates, clusters)
+
+    MarkdownReport(
+        args.output, logger,
+        graph_top_k=args.graph_top_k,
+        graph_min_weight=args.graph_min_weight,
+        graph_render_limit=args.graph_render_limit,
+    ).generate_summary(corpus, extractor, duplicates, clusters, passages)
 
 def main():
     parser = argparse.ArgumentParser(description="Content Inventory Generator")
     parser.add_argument("--source", required=True, help="Path to folder with content files")
     parser.add_argument("--output", required=True, help="Path to output directory")
+    parser.add_argument("--include", action="append", default=[], metavar="GLOB",
+                        help="Only process files matching this glob (relative path or name); repeatable")
+    parser.add_argument("--exclude", action="append", default=[], metavar="GLOB",
+                        help="Skip files and folders matching this glob (relative path or name); repeatable")
+    parser.add_argument("--max-file-mb", type=float, default=None, help="Skip files larger than this")
+    parser.add_argument("--manifest", default=None,
+                        help="Reuse the file list of an earlier run's manifest.csv instead of scanning --source")
+    parser.add_argument("--offline", action="store_true",
+                        help="Never download NLTK data; fail fast if any resource is missing")
+    parser.add_argument("--boilerplate-patterns", default=None,
+                        help="File of extra boilerplate regexes (one per line) removed before summarizing")
+    parser.add_argument("--large-doc-mb", type=float, default=None,
+                        help="Analyze documents larger than this in streamed windows (default 1 MB of text)")
+    parser.add_argument("--window-kb", type=int, default=None,
+                        help="Window size for large documents (default 100 KB of text)")
+    parser.add_argument("--sentiment-chunk-kb", type=int, default=None,
+                        help="Chunk size for sentiment scoring of large documents (default 10 KB)")
+    parser.add_argument("--summary-candidates", type=int, default=None,
+                        help="Candidate sentences kept per large document for the summary (default 100)")
+    parser.add_argument("--pdf-text-only", action="store_true",
+                        help="Extract PDF text without layout analysis (much faster, reading order may differ)")
+    parser.add_argument("--pdf-laparams", default=None,
+                        help="pdfminer layout parameters, e.g. 'line_margin=0.3,boxes_flow=none'")
+    parser.add_argument("--pdf-page-workers", type=int, default=None,
+                        help="Extract very large PDFs as page ranges in this many processes")
+    parser.add_argument("--pdf-parallel-min-pages", type=int, default=None,
+                        help="Minimum page count for page-range parallelism (default 200)")
+    parser.add_argument("--pdf-slow-page-seconds", type=float, default=None,
+                        help="Warn about PDF pages that take longer than this to extract (default 5)")
+    parser.add_argument("--docx-no-tables", action="store_true", help="Leave DOCX tables out of the extracted text")
+    parser.add_argument("--docx-no-headers", action="store_true",
+                        help="Leave DOCX headers and footers out of the extracted text")
+    parser.add_argument("--docx-no-footnotes", action="store_true",
+                        help="Leave DOCX footnotes and endnotes out of the extracted text")
+    parser.add_argument("--fast-workers", type=int, default=None,
+                        help="Workers in the pool for cheap formats (TXT, MD, HTML, XML, DOCX)")
+    parser.add_argument("--slow-workers", type=int, default=None,
+                        help="Workers in the pool for expensive formats (PDF)")
+    parser.add_argument("--file-timeout", type=float, default=None,
+                        help="Seconds a single file may take before it is set aside (uses process workers)")
+    parser.add_argument("--file-memory-mb", type=float, default=None,
+                        help="Memory per worker process for a file, on top of its loaded models (uses process workers)")
+    parser.add_argument("--no-retry", action="store_true",
+                        help="Quarantine failed files immediately instead of retrying them at the end")
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread",
+                        help="Parallel backend for parsing (process scales past the GIL)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of parsing workers (default: CPU count, threads capped at 8)")
+    parser.add_argument("--cache", default=None,
+                        help="Path to the incremental cache database (default: <output>/cache.db)")
+    parser.add_argument("--lsh-index", default=None,
+                        help="Path to the persistent LSH index database (default: <output>/lsh.db)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Re-process every file; do not read or update the cache or LSH index")
+    parser.add_argument("--shard", default=None, metavar="I/N",
+                        help="Process only shard I of N (by path hash) and write a partial shard.db for merging")
+    add_corpus_arguments(parser)
     args = parser.parse_args()
 
     logger = Logger(verbose=True)
     logger.info("Starting content inventory process...")
 
-    # 1. Ingest
-    ingestor = FileIngestor(logger)
-    corpus = ingestor.ingest_folder(args.source)
+    # 0. Verify NLP resources once, before any worker starts
+    try:
+        get_resources().verify(logger, offline=args.offline)
+    except LookupError as e:
+        logger.error(str(e))
+        raise SystemExit(1)
 
-    # 2. Analyze
-    extractor = EntityExtractor(logger)
-    extractor.process_corpus(corpus)
+    if args.boilerplate_patterns:
+        try:
+            patterns = load_patterns(args.boilerplate_patterns)
+            LuhnSummarizer.set_extra_patterns(patterns)
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not load boilerplate patterns: {e}")
+            raise SystemExit(1)
+        logger.info(f"Loaded {len(patterns)} boilerplate patterns from {args.boilerplate_patterns}.")
 
-    dupe_detector = DuplicateDetector(logger)
-    duplicates = dupe_detector.find_duplicates(corpus)
+    DocumentAnalyzer.configure(
+        large_doc_chars=args.large_doc_mb and int(args.large_doc_mb * 2 ** 20),
+        window_chars=args.window_kb and args.window_kb * 1024,
+        sentiment_chunk_chars=args.sentiment_chunk_kb and args.sentiment_chunk_kb * 1024,
+        max_candidates=args.summary_candidates,
+    )
 
-    # 3. Persist results in SQLite  ← ADD THIS BLOCK HERE
-    repo = Repository(os.path.join(args.output, "inventory.db"), logger)
-    for doc in corpus:
-        repo.insert_document(doc)
-    repo.insert_entities(extractor.entities)
-    repo.insert_duplicates(duplicates)
-    repo.close()
+    try:
+        PDFParser.configure(
+            text_only=args.pdf_text_only or None,
+            laparams=parse_laparams(args.pdf_laparams),
+            page_workers=args.pdf_page_workers,
+            parallel_min_pages=args.pdf_parallel_min_pages,
+            slow_page_seconds=args.pdf_slow_page_seconds,
+        )
+    except (TypeError, ValueError) as e:
+        logger.error(f"Invalid PDF settings: {e}")
+        raise SystemExit(1)
 
-    # 4. Export reports
+    DocxParser.configure(
+        tables=not args.docx_no_tables,
+        headers=not args.docx_no_headers,
+        footnotes=not args.docx_no_footnotes,
+    )
+
+    shard = None
+    if args.shard:
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as e:
+            logger.error(f"Invalid --shard '{args.shard}': {e}")
+            raise SystemExit(1)
+
+    os.makedirs(args.output, exist_ok=True)
+    cache = None
+    lsh_index = None
+    if not args.no_cache:
+        cache = FileCache(args.cache or os.path.join(args.output, "cache.db"), logger,
+                          require_segments=not args.no_segments)
+        if shard is None:
+            # Sharded runs detect duplicates in the merge step
+            lsh_index = PersistentLSH(
+                args.lsh_index or os.path.join(args.output, "lsh.db"), logger,
+                num_perm=DuplicateDetector.NUM_PERM, signature_dtype=DuplicateDetector.SIGNATURE_DTYPE,
+            )
+
+    discovery = FileDiscovery(
+        logger, include=args.include, exclude=args.exclude,
+        max_bytes=int(args.max_file_mb * 2 ** 20) if args.max_file_mb else None,
+    )
+    if args.manifest:
+        entries = discovery.read_manifest(args.manifest, root=args.source)
+    else:
+        entries = discovery.scan(args.source)
+    if shard is not None:
+        entries = select_shard(entries, args.source, *shard)
+        logger.info(f"Shard {args.shard}: {len(entries)} files.")
+    discovery.write_manifest(entries, os.path.join(args.output, "manifest.csv"))
+
+    ingestor = FileIngestor(
+        logger, executor=args.executor, workers=args.workers, extract_entities=True,
+        file_timeout=args.file_timeout, file_memory_mb=args.file_memory_mb, retry_failed=not args.no_retry,
+        pool_workers={"fast": args.fast_workers, "slow": args.slow_workers},
+        fingerprint="document" if args.no_segments else "segments",
+    )
+    extractor = build_extractor(args, logger)
+    dupe_detector = DuplicateDetector(logger, index=lsh_index)
+    segment_detector = build_segment_detector(args, logger)
     csv_exporter = CSVExporter(args.output, logger)
-    csv_exporter.export_inventory(corpus, duplicates)
-    csv_exporter.export_entities(extractor.entities)
-    csv_exporter.export_duplicates(duplicates)
+    parquet_exporter = build_parquet_exporter(args, logger) if shard is None else None
+    if shard is None:
+        repo = Repository(os.path.join(args.output, "inventory.db"), logger, batch_size=args.db_batch_size)
+        db_writer = BackgroundWriter(repo, logger)
+        inventory = csv_exporter.inventory_writer()
+    else:
+        shard_store = ShardStore(os.path.join(args.output, "shard.db"), logger, write=True,
+                                 batch_size=args.db_batch_size)
+        shard_store.write_meta(*shard, source=args.source, segments=segment_detector is not None)
+
+    # 1. Stream each document through parse -> entities -> fingerprint -> DB/CSV
+    #    (or the shard artifact). Noun phrases, signatures, passage fingerprints and
+    #    content hashes are computed inside the parsing workers, so no full text
+    #    reaches this process. Only compact records are kept for the corpus-level stages.
+    logger.info("Extracting normalized noun phrases and fingerprints per document...")
+    corpus = []
+    for doc in ingestor.iter_folder(args.source, cache=cache, entries=entries, fresh=not args.manifest):
+        extractor.process_document(doc)
+        dupe_detector.add_document(doc)
+        if segment_detector is not None:
+            segment_detector.add_document(doc)
+        if cache is not None:
+            cache.store(doc)
+        if shard is None:
+            db_writer.insert_document(doc)
+            inventory.write(doc)
+        else:
+            shard_store.add_document(doc)
+        # The entity index now holds this document's phrases
+        doc.pop("text", None)
+        doc.pop("annotation", None)
+        doc.pop("entities", None)
+        doc.pop("segments", None)
+        corpus.append(doc)
+
+    if cache is not None:
+        cache.commit()
+        cache.evict_missing(doc["path"] for doc in corpus)
+        cache.close()
+
+    if shard is not None:
+        shard_store.write_entities(extractor.finalize())
+        shard_store.write_quarantine(ingestor.quarantined)
+        shard_store.close()
+        csv_exporter.export_quarantine(ingestor.quarantined)
+        logger.success(f"Shard {args.shard} completed: {shard_store.count} documents in "
+                       f"{os.path.join(args.output, 'shard.db')}.")
+        return
 
-    MarkdownReport(args.output, logger).generate_summary(corpus, extractor, duplicates)
+    inventory.close()
+    report_corpus(args, logger, corpus, extractor, dupe_detector, segment_detector,
+                  db_writer, csv_exporter, ingestor.quarantined, parquet_exporter)
+    if lsh_index is not None:
+        lsh_index.close()
 
     logger.success("Content inventory completed successfully.")
 
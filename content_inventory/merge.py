@@ -0,0 +1,111 @@
+"""
+Merge step of a sharded run.
+
+Combines the shard.db artifacts written by `main --shard I/N` into one
+inventory.db with cross-shard duplicate and passage detection over the merged
+fingerprints, plus the usual CSV and Markdown reports.
+"""
+import argparse
+import os
+from content_inventory.utils.logger import Logger
+from content_inventory.analysis.duplicate_detector import DuplicateDetector
+from content_inventory.reports.csv_exporter import CSVExporter
+from content_inventory.database.repository import Repository
+from content_inventory.database.background_writer import BackgroundWriter
+from content_inventory.database.shard_store import ShardStore
+from content_inventory.main import (
+    add_corpus_arguments, build_extractor, build_parquet_exporter, build_segment_detector, report_corpus,
+)
+
+
+def open_shards(paths, logger):
+    """Open every shard artifact and check that together they form one complete run.
+
+    Returns the stores ordered by shard index, so the merge is deterministic
+    whatever order the shards are given or finished in."""
+    stores = {}
+    expected = None
+    versions = set()
+    for path in paths:
+        if os.path.isdir(path):
+            path = os.path.join(path, "shard.db")
+        if not os.path.exists(path):
+            raise ValueError(f"No shard artifact at {path}")
+        store = ShardStore(path, logger)
+        meta = store.meta()
+        index, count = (int(x) for x in meta["shard"].split("/"))
+        if expected is None:
+            expected = count
+        elif count != expected:
+            raise ValueError(f"{path} is shard {meta['shard']}, but other shards are out of {expected}")
+        if index in stores:
+            raise ValueError(f"Shard {meta['shard']} given twice ({stores[index].db_path} and {path})")
+        versions.add(meta["version"])
+        stores[index] = store
+
+    if not stores:
+        raise ValueError("No shards given")
+    missing = sorted(set(range(expected)) - stores.keys())
+    if missing:
+        raise ValueError(f"Missing shards {', '.join(f'{i}/{expected}' for i in missing)}")
+    if len(versions) > 1:
+        raise ValueError("Shards were produced with different analysis settings or versions")
+    return [stores[i] for i in sorted(stores)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge the shards of a sharded content inventory run")
+    parser.add_argument("shards", nargs="+", help="Shard output directories (or their shard.db files)")
+    parser.add_argument("--output", required=True, help="Path to output directory")
+    add_corpus_arguments(parser)
+    args = parser.parse_args()
+
+    logger = Logger(verbose=True)
+    logger.info(f"Merging {len(args.shards)} shards...")
+    try:
+        stores = open_shards(args.shards, logger)
+    except (ValueError, KeyError) as e:
+        logger.error(f"Cannot merge: {e}")
+        raise SystemExit(1)
+
+    if not args.no_segments and any(store.meta()["segments"] != "1" for store in stores):
+        logger.warn("Some shards were run with --no-segments; skipping passage reuse detection.")
+        args.no_segments = True
+
+    os.makedirs(args.output, exist_ok=True)
+    extractor = build_extractor(args, logger)
+    dupe_detector = DuplicateDetector(logger)
+    segment_detector = build_segment_detector(args, logger)
+    repo = Repository(os.path.join(args.output, "inventory.db"), logger, batch_size=args.db_batch_size)
+    db_writer = BackgroundWriter(repo, logger)
+    csv_exporter = CSVExporter(args.output, logger)
+    parquet_exporter = build_parquet_exporter(args, logger)
+
+    # Replay every shard's documents through the same stages as a single run;
+    # entities, signatures and segments come from the shard, nothing is re-parsed
+    corpus = []
+    quarantined = []
+    with csv_exporter.inventory_writer() as inventory:
+        for store in stores:
+            for doc in store.iter_documents():
+                extractor.process_document(doc)
+                dupe_detector.add_document(doc)
+                if segment_detector is not None:
+                    segment_detector.add_document(doc)
+                db_writer.insert_document(doc)
+                inventory.write(doc)
+                doc.pop("text", None)
+                doc.pop("entities", None)
+                doc.pop("segments", None)
+                corpus.append(doc)
+            quarantined.extend(store.quarantined())
+            store.close()
+    logger.info(f"Merged {len(corpus)} documents from {len(stores)} shards.")
+
+    report_corpus(args, logger, corpus, extractor, dupe_detector, segment_detector,
+                  db_writer, csv_exporter, quarantined, parquet_exporter)
+    logger.success("Merged content inventory completed successfully.")
+
+
+if __name__ == "__main__":
+    main()
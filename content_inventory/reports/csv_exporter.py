@@ -1,35 +1,104 @@
 import csv
 import os
 
+class InventoryWriter:
+    """Writes inventory.csv one document at a time so rows never accumulate in memory."""
+
+    def __init__(self, path):
+        self.file = open(path, "w", newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(["Filename", "Word Count", "Summary"])
+
+    def write(self, doc):
+        self.writer.writerow([doc["filename"], doc["word_count"], doc["summary"]])
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
 class CSVExporter:
     def __init__(self, output_dir, logger):
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
         self.logger = logger
 
+    def inventory_writer(self):
+        self.logger.info("Streaming inventory CSV...")
+        return InventoryWriter(os.path.join(self.output_dir, "inventory.csv"))
+
     def export_inventory(self, corpus, duplicates):
         self.logger.info("Exporting inventory CSV...")
-        path = os.path.join(self.output_dir, "inventory.csv")
-        with open(path, "w", newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(["Filename", "Word Count", "Summary"])
+        with InventoryWriter(os.path.join(self.output_dir, "inventory.csv")) as writer:
             for doc in corpus:
-                writer.writerow([doc["filename"], doc["word_count"], doc["summary"]])
+                writer.write(doc)
 
     def export_entities(self, entities):
         self.logger.info("Exporting entities CSV...")
         path = os.path.join(self.output_dir, "entities.csv")
         with open(path, "w", newline='') as f:
             writer = csv.writer(f)
-            writer.writerow(["Entity", "Count"])
+            errors = getattr(entities, "errors", None)
+            if errors is None:
+                writer.writerow(["Entity", "Count"])
+                for entity, count in entities.items():
+                    writer.writerow([entity, count])
+                return
+            # Approximate counts: Count overestimates the true count by at most Error
+            writer.writerow(["Entity", "Count", "Error"])
             for entity, count in entities.items():
-                writer.writerow([entity, count])
+                writer.writerow([entity, count, errors[entity]])
+
+    def export_entity_documents(self, index):
+        """Export the entity -> document postings of an EntityIndex."""
+        self.logger.info("Exporting entity-document index CSV...")
+        path = os.path.join(self.output_dir, "entity_documents.csv")
+        with open(path, "w", newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["Entity", "Document ID", "Path", "Count"])
+            for entity, doc_id, doc_path, _, count in index.iter_postings():
+                writer.writerow([entity, doc_id, doc_path, count])
 
     def export_duplicates(self, duplicates):
         self.logger.info("Exporting duplicates CSV...")
         path = os.path.join(self.output_dir, "duplicates.csv")
         with open(path, "w", newline='') as f:
             writer = csv.writer(f)
-            writer.writerow(["Doc1", "Doc2", "Similarity"])
+            writer.writerow(["Doc1", "Doc2", "Similarity", "Kind"])
             for dupe in duplicates:
-                writer.writerow([dupe["doc1"], dupe["doc2"], dupe["similarity"]])
+                writer.writerow([dupe["doc1"], dupe["doc2"], dupe["similarity"], dupe.get("kind", "document")])
+
+    def export_passages(self, passages):
+        self.logger.info("Exporting reused passages CSV...")
+        path = os.path.join(self.output_dir, "reused_passages.csv")
+        with open(path, "w", newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["Doc1", "Start1", "End1", "Doc2", "Start2", "End2", "Length"])
+            for p in passages:
+                writer.writerow([p["doc1"], p["start1"], p["end1"], p["doc2"], p["start2"], p["end2"], p["length"]])
+
+    def export_quarantine(self, quarantined):
+        self.logger.info("Exporting quarantined files CSV...")
+        path = os.path.join(self.output_dir, "quarantine.csv")
+        with open(path, "w", newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["Path", "Reason"])
+            for q in quarantined:
+                writer.writerow([q["path"], q["reason"]])
+
+    def export_clusters(self, clusters):
+        self.logger.info("Exporting duplicate clusters CSV...")
+        path = os.path.join(self.output_dir, "duplicate_clusters.csv")
+        with open(path, "w", newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["Cluster ID", "Representative", "Size", "Max Similarity", "Min Similarity", "Members"])
+            for c in clusters:
+                writer.writerow([
+                    c["cluster_id"], c["representative"], c["size"],
+                    c["max_similarity"], c["min_similarity"], "; ".join(c["members"])
+                ])
@@ -0,0 +1,53 @@
+from xml.sax.saxutils import quoteattr, escape
+
+_GRAPHML_TYPES = {str: "string", int: "long", float: "double"}
+
+
+class GraphMLWriter:
+    """Writes GraphML node by node and edge by edge, without building a graph in memory.
+
+    node_keys and edge_keys map attribute names to Python types (str, int, float).
+    Nodes must all be written before edges."""
+
+    def __init__(self, path, node_keys, edge_keys, directed=False):
+        self.file = open(path, "w", encoding="utf-8")
+        self.node_keys = node_keys
+        self.edge_keys = edge_keys
+        self.file.write(
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+        )
+        for scope, keys in (("node", node_keys), ("edge", edge_keys)):
+            for name, kind in keys.items():
+                self.file.write(
+                    f'  <key id={quoteattr(scope + "_" + name)} for="{scope}" '
+                    f'attr.name={quoteattr(name)} attr.type="{_GRAPHML_TYPES[kind]}" />\n'
+                )
+        edgedefault = "directed" if directed else "undirected"
+        self.file.write(f'  <graph edgedefault="{edgedefault}">\n')
+
+    def _data(self, scope, keys, attrs):
+        return "".join(
+            f'<data key={quoteattr(scope + "_" + name)}>{escape(str(attrs[name]))}</data>'
+            for name in keys if name in attrs
+        )
+
+    def node(self, node_id, **attrs):
+        data = self._data("node", self.node_keys, attrs)
+        self.file.write(f"    <node id={quoteattr(str(node_id))}>{data}</node>\n")
+
+    def edge(self, source, target, **attrs):
+        data = self._data("edge", self.edge_keys, attrs)
+        self.file.write(
+            f"    <edge source={quoteattr(str(source))} target={quoteattr(str(target))}>{data}</edge>\n"
+        )
+
+    def close(self):
+        self.file.write("  </graph>\n</graphml>\n")
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
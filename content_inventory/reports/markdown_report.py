@@ -1,17 +1,21 @@
 import os
 import networkx as nx
 import matplotlib.pyplot as plt
-from collections import defaultdict
+from content_inventory.analysis.cooccurrence import CooccurrenceBuilder
+from content_inventory.reports.graphml_writer import GraphMLWriter
 
 class MarkdownReport:
     """Generates Markdown summary and visualizations for duplication and semantic relationships."""
 
-    def __init__(self, output_dir, logger):
+    def __init__(self, output_dir, logger, graph_top_k=500, graph_min_weight=2, graph_render_limit=300):
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
         self.logger = logger
+        self.graph_top_k = graph_top_k
+        self.graph_min_weight = graph_min_weight
+        self.graph_render_limit = graph_render_limit
 
-    def generate_summary(self, corpus, extractor, duplicates):
+    def generate_summary(self, corpus, extractor, duplicates, clusters=(), passages=()):
         """Generates corpus summary, duplication insight, and visualization."""
         self.logger.info("Generating Markdown summary report...")
         total_words = sum(doc['word_count'] for doc in corpus)
@@ -21,26 +25,56 @@ class MarkdownReport:
             "# Content Inventory Summary",
             f"**Total Files:** {total_files}",
             f"**Total Words:** {total_words}",
-            f"**Duplicate Pairs:** {len(duplicates)}",
+            f"**Duplicate Pairs:** {sum(1 for d in duplicates if d.get('kind', 'document') == 'document')}",
+            f"**Pairs Sharing Passages:** {sum(1 for d in duplicates if d.get('kind') == 'segment')}",
+            f"**Reused Passages:** {len(passages)}",
+            f"**Duplicate Clusters:** {len(clusters)}",
             "",
             "## Top 50 Entities",
         ]
 
         # Add top entities
         top_entities = extractor.entities.most_common(50)
+        errors = getattr(extractor.entities, "errors", None)
         for e, c in top_entities:
-            report_lines.append(f"- {e}: {c}")
+            if errors is None:
+                report_lines.append(f"- {e}: {c}")
+            else:
+                report_lines.append(f"- {e}: {c} (overestimated by at most {errors[e]})")
+
+        # Add the largest duplicate clusters
+        if clusters:
+            report_lines.append("\n## Top 10 Duplicate Clusters\n")
+            for cluster in clusters[:10]:
+                report_lines.append(
+                    f"- Cluster {cluster['cluster_id']}: {cluster['size']} documents, "
+                    f"representative `{cluster['representative']}`, "
+                    f"similarity {cluster['min_similarity']:.2f}-{cluster['max_similarity']:.2f}"
+                )
+
+        # Add the longest reused passages
+        if passages:
+            report_lines.append("\n## Top 10 Reused Passages\n")
+            for p in sorted(passages, key=lambda p: -p["length"])[:10]:
+                report_lines.append(
+                    f"- `{p['doc1']}` [{p['start1']}:{p['end1']}] = "
+                    f"`{p['doc2']}` [{p['start2']}:{p['end2']}] ({p['length']} characters)"
+                )
 
         # Create and embed graphs
-        reuse_graph_path = self._generate_reuse_graph(corpus, duplicates)
+        reuse_graph_path = self._generate_reuse_graph(clusters)
         entity_graph_path = self._generate_entity_relationship_graph(corpus, extractor)
 
-        report_lines += [
-            "\n## Duplication Network\n",
-            f"![Duplication Network]({os.path.basename(reuse_graph_path)})",
-            "\n## Semantic Map (Entity Relationships)\n",
-            f"![Semantic Map]({os.path.basename(entity_graph_path)})"
-        ]
+        if reuse_graph_path:
+            report_lines += [
+                "\n## Duplication Network\n",
+                f"![Duplication Network]({os.path.basename(reuse_graph_path)})",
+            ]
+        report_lines.append("\n## Semantic Map (Entity Relationships)\n")
+        if entity_graph_path:
+            report_lines.append(f"![Semantic Map]({os.path.basename(entity_graph_path)})")
+        else:
+            report_lines.append("Graph too large to render; see `entity_relationship.graphml`.")
 
         report_path = os.path.join(self.output_dir, "report.md")
         with open(report_path, "w", encoding="utf-8") as f:
@@ -51,102 +85,148 @@ class MarkdownReport:
     # ----------------------------------------------------------------
     # REUSE NETWORK GRAPH (DOCUMENT-LEVEL DUPLICATION)
     # ----------------------------------------------------------------
-    def _generate_reuse_graph(self, corpus, duplicates):
-        """Create a reuse network with document names and similarity weights."""
-        if not duplicates:
+    def _generate_reuse_graph(self, clusters):
+        """Create a reuse network from the near-duplicate clusters.
+
+        Each cluster is drawn as a star around its representative document, so
+        the graph grows with the number of documents rather than with pairs."""
+        if not clusters:
             return None
 
-        G = nx.DiGraph()
+        # Save .graphml (streamed; every cluster)
+        graphml_path = os.path.join(self.output_dir, "reuse_network.graphml")
+        with GraphMLWriter(
+            graphml_path,
+            node_keys={"label": str, "cluster_id": int, "representative": int},
+            edge_keys={"weight": float, "label": str},
+        ) as writer:
+            for cluster in clusters:
+                rep = cluster["representative"]
+                for member in cluster["members"]:
+                    writer.node(member, label=os.path.basename(member), cluster_id=cluster["cluster_id"],
+                                representative=int(member == rep))
+            for cluster in clusters:
+                for member, sim in self._star_edges(cluster):
+                    if sim is None:
+                        writer.edge(cluster["representative"], member)
+                    else:
+                        writer.edge(cluster["representative"], member, weight=sim, label=f"{sim:.2f}")
+
+        # Quick PNG visualization of the largest clusters
+        if self.graph_render_limit <= 0:
+            self.logger.info("Skipping reuse network PNG rendering.")
+            return None
 
-        # Add nodes with metadata
-        for idx, doc in enumerate(corpus):
-            G.add_node(
-                doc["filename"],
-                label=doc["filename"],
-                document_id=str(idx),
-                word_count=doc["word_count"]
+        # Fill the node budget cluster by cluster; a cluster that does not fit is
+        # sampled to its representative and most similar members
+        G = nx.Graph()
+        sampled = 0
+        for cluster in clusters:
+            room = self.graph_render_limit - G.number_of_nodes()
+            if room < 2:
+                break
+            edges = list(self._star_edges(cluster))
+            if len(edges) >= room:
+                edges = sorted(edges, key=lambda e: (e[1] is None, -(e[1] or 0.0), e[0]))[:room - 1]
+                sampled += 1
+            for member, sim in edges:
+                G.add_edge(cluster["representative"], member, weight=sim)
+        if G.number_of_nodes() == 0:
+            self.logger.info("Skipping reuse network PNG rendering.")
+            return None
+        shown = sum(1 for c in clusters if c["representative"] in G)
+        if shown < len(clusters) or sampled:
+            self.logger.info(
+                f"Reuse network PNG limited to {G.number_of_nodes()} documents "
+                f"({shown} of {len(clusters)} clusters, {sampled} sampled)."
             )
 
-        # Add edges between duplicate docs
-        for d in duplicates:
-            src, tgt = d["doc1"], d["doc2"]
-            sim = d.get("similarity", 1.0)
-            if G.has_edge(src, tgt):
-                G[src][tgt]["weight"] = max(G[src][tgt]["weight"], sim)
-            else:
-                G.add_edge(src, tgt, weight=sim, label=f"{sim:.2f}")
-
-        # Save .graphml
-        graphml_path = os.path.join(self.output_dir, "reuse_network.graphml")
-        nx.write_graphml(G, graphml_path)
-
-        # Quick PNG visualization
         plt.figure(figsize=(10, 8))
         pos = nx.spring_layout(G, k=0.3, iterations=50)
-        weights = [d["weight"] * 3 for _, _, d in G.edges(data=True)]
-        nx.draw(
-            G, pos,
-            node_size=80,
-            edge_color=weights,
-            width=1.5,
-            edge_cmap=plt.cm.Blues,
-            with_labels=False
-        )
-        plt.title("Reuse Network (Duplicate Documents)", fontsize=12)
+        scored = [(u, v) for u, v, w in G.edges(data="weight") if w is not None]
+        unscored = [(u, v) for u, v, w in G.edges(data="weight") if w is None]
+        nx.draw_networkx_nodes(G, pos, node_size=80)
+        if scored:
+            nx.draw_networkx_edges(
+                G, pos, edgelist=scored,
+                edge_color=[G.edges[e]["weight"] * 3 for e in scored],
+                width=1.5,
+                edge_cmap=plt.cm.Blues,
+            )
+        if unscored:
+            # Members linked to the representative only through other members
+            nx.draw_networkx_edges(G, pos, edgelist=unscored, edge_color="lightgrey", width=1.0, style="dashed")
+        plt.axis("off")
+        plt.title("Reuse Network (Duplicate Documents and Shared Passages)", fontsize=12)
         plt.tight_layout()
         png_path = os.path.join(self.output_dir, "reuse_network.png")
         plt.savefig(png_path, dpi=150)
         plt.close()
         return png_path
 
+    @staticmethod
+    def _star_edges(cluster):
+        """(member, similarity to representative) for every non-representative member.
+
+        The similarity is None when the member has no direct pair with the
+        representative; such edges show cluster membership, not a score."""
+        rep = cluster["representative"]
+        for member in cluster["members"]:
+            if member != rep:
+                yield member, cluster["edges"].get(member)
+
     # ----------------------------------------------------------------
     # ENTITY RELATIONSHIP GRAPH (SEMANTIC MAP WITH DOCUMENT IDS)
     # ----------------------------------------------------------------
     def _generate_entity_relationship_graph(self, corpus, extractor):
         """Create a semantic network of entities showing co-occurrence relationships,
-        annotated with the documents in which each entity appears."""
-        self.logger.info("Building entity relationship graph (semantic map with document IDs)...")
+        annotated with the documents in which each entity appears.
 
-        entity_graph = nx.Graph()
-        entity_docs = defaultdict(set)
-        cooccurrence = defaultdict(lambda: defaultdict(int))
-
-        # Step 1: Map entities to documents
-        for idx, doc in enumerate(corpus):
-            doc_id = str(idx)
-            filename = doc["filename"]
-            text = doc["text"].lower()
-
-            for entity, _ in extractor.entities.items():
-                if entity in text:
-                    entity_docs[entity].add(f"{doc_id}:{filename}")
-
-        # Step 2: Build co-occurrence relationships
-        for doc_entities in entity_docs.values():
-            entities = list(doc_entities)
-            for i in range(len(entities)):
-                for j in range(i + 1, len(entities)):
-                    e1, e2 = sorted([entities[i], entities[j]])
-                    cooccurrence[e1][e2] += 1
-
-        # Step 3: Create graph nodes and edges
-        for entity, docs in entity_docs.items():
-            entity_graph.add_node(
-                entity,
-                label=entity,
-                documents="; ".join(sorted(docs)),
-                doc_count=len(docs)
-            )
+        Co-occurrences are counted sparsely over the top entities only. The GraphML
+        file is streamed to disk; the PNG shows at most graph_render_limit nodes
+        and is skipped entirely when that limit is 0."""
+        self.logger.info("Building entity relationship graph (semantic map with document IDs)...")
 
-        for e1, targets in cooccurrence.items():
-            for e2, count in targets.items():
-                entity_graph.add_edge(e1, e2, weight=count, label=str(count))
+        index = extractor.index
+        # With approximate counts, only the reported heavy hitters are mapped
+        candidates = None
+        if extractor.heavy_hitters is not None:
+            candidates = [entity for entity, _ in extractor.heavy_hitters.items()]
+        graph = CooccurrenceBuilder(
+            top_k=self.graph_top_k, min_weight=self.graph_min_weight
+        ).build(index, candidates)
+        self.logger.info(
+            f"Semantic map: {graph.num_nodes} entities, {graph.num_edges} co-occurrence edges "
+            f"(top {self.graph_top_k}, min weight {self.graph_min_weight})."
+        )
 
-        # Step 4: Save GraphML
+        # Step 1: Stream GraphML (nodes annotated with the documents they occur in)
         graphml_path = os.path.join(self.output_dir, "entity_relationship.graphml")
-        nx.write_graphml(entity_graph, graphml_path)
+        with GraphMLWriter(
+            graphml_path,
+            node_keys={"label": str, "documents": str, "doc_count": int},
+            edge_keys={"weight": int, "label": str},
+        ) as writer:
+            for entity, doc_count in zip(graph.entities, graph.doc_counts):
+                docs = sorted(index.label(doc_id) for doc_id in index.postings[entity])
+                writer.node(entity, label=entity, documents="; ".join(docs), doc_count=int(doc_count))
+            for i, j, w in zip(graph.rows, graph.cols, graph.weights):
+                writer.edge(graph.entities[i], graph.entities[j], weight=int(w), label=str(w))
+
+        # Step 2: Visualize (sampled to the most frequent entities above the cap)
+        if self.graph_render_limit <= 0 or graph.num_nodes == 0:
+            self.logger.info("Skipping semantic map PNG rendering.")
+            return None
+
+        limit = min(graph.num_nodes, self.graph_render_limit)
+        if limit < graph.num_nodes:
+            self.logger.info(f"Semantic map PNG sampled to the top {limit} of {graph.num_nodes} entities.")
+        entity_graph = nx.Graph()
+        entity_graph.add_nodes_from(graph.entities[:limit])
+        shown = (graph.rows < limit) & (graph.cols < limit)
+        for i, j, w in zip(graph.rows[shown], graph.cols[shown], graph.weights[shown]):
+            entity_graph.add_edge(graph.entities[i], graph.entities[j], weight=int(w))
 
-        # Step 5: Visualize graph
         plt.figure(figsize=(12, 9))
         pos = nx.spring_layout(entity_graph, k=0.4, iterations=40)
         weights = [d["weight"] for _, _, d in entity_graph.edges(data=True)]
@@ -163,4 +243,4 @@ class MarkdownReport:
         png_path = os.path.join(self.output_dir, "entity_relationship.png")
         plt.savefig(png_path, dpi=150)
         plt.close()
-        return png_path
\ No newline at end of file
+        return png_path
@@ -0,0 +1,135 @@
+import os
+from itertools import islice
+from operator import itemgetter
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: only needed for --parquet
+    pa = pq = None
+
+from content_inventory.analysis.document_analyzer import SENTIMENT_FIELDS
+
+
+class RowGroupWriter:
+    """Writes a Parquet file in row groups, buffering at most one group of records.
+
+    Each schema field has a getter that maps a record to its value; a group is
+    turned into typed Arrow columns one field at a time, without building a
+    tuple per row, so memory stays bounded however many records there are."""
+
+    def __init__(self, path, schema, row_group_size, compression):
+        self.schema = schema
+        self.row_group_size = row_group_size
+        self.writer = pq.ParquetWriter(path, schema, compression=compression)
+        self.count = 0
+
+    def write_records(self, records, getters):
+        records = iter(records)
+        while True:
+            group = list(islice(records, self.row_group_size))
+            if not group:
+                return
+            columns = [pa.array([get(r) for r in group], type=field.type)
+                       for get, field in zip(getters, self.schema)]
+            self.writer.write_table(pa.Table.from_arrays(columns, schema=self.schema))
+            self.count += len(group)
+
+    def close(self):
+        self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ParquetExporter:
+    """Typed, compressed, columnar counterparts of the main CSV reports.
+
+    inventory.parquet carries the sentiment components, path and duplicate
+    cluster id of every document; duplicates.parquet the cluster id of each
+    pair. Read them back with pandas.read_parquet or pyarrow.parquet."""
+
+    def __init__(self, output_dir, logger, row_group_size=100_000, compression="zstd"):
+        if pa is None:
+            raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+        self.output_dir = output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        self.logger = logger
+        self.row_group_size = row_group_size
+        self.compression = compression
+
+    def _writer(self, name, schema):
+        path = os.path.join(self.output_dir, name)
+        return RowGroupWriter(path, schema, self.row_group_size, self.compression)
+
+    @staticmethod
+    def _cluster_ids(clusters):
+        """Document path -> duplicate cluster id."""
+        return {member: c["cluster_id"] for c in clusters for member in c["members"]}
+
+    def export_inventory(self, corpus, clusters):
+        """One row per document; doc_id matches the Document ID of entity_documents.csv."""
+        self.logger.info("Exporting inventory Parquet...")
+        schema = pa.schema(
+            [
+                ("doc_id", pa.int64()),
+                ("path", pa.string()),
+                ("filename", pa.string()),
+                ("content_hash", pa.string()),
+                ("word_count", pa.int64()),
+                ("summary", pa.string()),
+            ]
+            + [(f"sentiment_{field}", pa.float64()) for field in SENTIMENT_FIELDS]
+            + [("cluster_id", pa.int32())]
+        )
+        cluster_ids = self._cluster_ids(clusters)
+        getters = [
+            itemgetter(0),
+            lambda r: r[1]["path"],
+            lambda r: r[1]["filename"],
+            lambda r: r[1].get("content_hash"),
+            lambda r: r[1]["word_count"],
+            lambda r: r[1]["summary"],
+        ] + [
+            lambda r, field=field: r[1]["sentiment"].get(field) for field in SENTIMENT_FIELDS
+        ] + [
+            lambda r: cluster_ids.get(r[1]["path"]),
+        ]
+        with self._writer("inventory.parquet", schema) as writer:
+            writer.write_records(enumerate(corpus), getters)
+
+    def export_entities(self, entities):
+        self.logger.info("Exporting entities Parquet...")
+        errors = getattr(entities, "errors", None)
+        fields = [("entity", pa.string()), ("count", pa.int64())]
+        getters = [itemgetter(0), itemgetter(1)]
+        if errors is not None:
+            # Approximate counts: count overestimates the true count by at most error
+            fields.append(("error", pa.int64()))
+            getters.append(lambda r: errors[r[0]])
+        with self._writer("entities.parquet", pa.schema(fields)) as writer:
+            writer.write_records(entities.items(), getters)
+
+    def export_duplicates(self, duplicates, clusters):
+        self.logger.info("Exporting duplicates Parquet...")
+        schema = pa.schema([
+            ("doc1", pa.string()),
+            ("doc2", pa.string()),
+            ("similarity", pa.float64()),
+            ("kind", pa.dictionary(pa.int8(), pa.string())),
+            ("cluster_id", pa.int32()),
+        ])
+        cluster_ids = self._cluster_ids(clusters)
+        getters = [
+            itemgetter("doc1"),
+            itemgetter("doc2"),
+            itemgetter("similarity"),
+            lambda d: d.get("kind", "document"),
+            # Passage pairs are not clustered; they get an id only inside one cluster
+            lambda d: cluster_ids.get(d["doc1"]) if cluster_ids.get(d["doc1"]) == cluster_ids.get(d["doc2"]) else None,
+        ]
+        with self._writer("duplicates.parquet", schema) as writer:
+            writer.write_records(duplicates, getters)
@@ -13,3 +13,4 @@ class Logger:
     def success(self, msg): self._log("SUCCESS", msg)
     def warn(self, msg): self._log("WARN", msg)
     def error(self, msg): self._log("ERROR", msg)
+    def debug(self, msg): self._log("DEBUG", msg)
@@ -0,0 +1,22 @@
+import copy
+
+
+class ClassSettings:
+    """Options kept as class attributes, so main can change them once with
+    configure() and hand settings() to process workers, which do not inherit
+    class state. Subclasses list the attribute names in SETTINGS."""
+
+    SETTINGS = ()
+
+    @classmethod
+    def settings(cls):
+        return {name: copy.copy(getattr(cls, name)) for name in cls.SETTINGS}
+
+    @classmethod
+    def configure(cls, **settings):
+        """Set the given options; None keeps the current value (an unset flag)."""
+        for name, value in settings.items():
+            if name not in cls.SETTINGS:
+                raise ValueError(f"Unknown {cls.__name__} setting '{name}'")
+            if value is not None:
+                setattr(cls, name, value)